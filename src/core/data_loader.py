@@ -1,21 +1,74 @@
 import pandas as pd
+import numpy as np
+import datetime
+import hashlib
+import io
+import mmap
 import os
 import re
-from typing import Dict, List, Any, Tuple, Optional
+import tempfile
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Dict, List, Any, Tuple, Optional, Iterator, Callable
+
+# 优先使用calamine引擎（Rust实现，解析xlsx更快），未安装时回退到openpyxl
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    EXCEL_ENGINE = "openpyxl"
+
+# 启用pandas写时复制（Copy-on-Write）：get_data返回的缓存DataFrame及其切片
+# 在调用方修改时才会真正复制，不会污染缓存，调用方也无需再做防御性copy()
+# pandas 3.0起写时复制为默认且唯一行为，该选项已废弃，仅在旧版本上设置
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+# 源文件stat结果的缓存有效期（秒），窗口内重复加载不再重复stat
+_STAT_TTL = 1.0
+
+# 带时间部分的日期列名，如 '2025-03-02 00:00:00.1' 或 '2025-03-02T00:00:00'
+_DATE_COL_RE = re.compile(r'\d{4}-\d{2}-\d{2}[\sT]\d{2}:\d{2}:\d{2}')
+# 匹配上述格式所需的最短长度，更短的字符串无需执行正则
+_DATE_COL_MIN_LEN = 19
+
+def _ffill_codes(codes: np.ndarray) -> np.ndarray:
+    """
+    沿第0轴对factorize得到的整数编码做前向填充，-1表示缺失值
+    支持二维数组（每列一个字段），一次调用完成所有列的填充；
+    开头的缺失值没有可填充的前值，保持为-1
+    """
+    rows = np.arange(codes.shape[0]).reshape((-1,) + (1,) * (codes.ndim - 1))
+    positions = np.where(codes != -1, rows, 0)
+    np.maximum.accumulate(positions, axis=0, out=positions)
+    return np.take_along_axis(codes, positions, axis=0)
 
 class DataLoader:
     """
     Class for loading and processing Excel data files for the production scheduling system.
     """
     
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data",
+                 usecols_map: Optional[Dict[Any, Any]] = None,
+                 nrows_map: Optional[Dict[Any, int]] = None,
+                 use_cache: bool = True):
         """
         Initialize the DataLoader with the directory containing data files.
         
         Args:
             data_dir: Directory containing the Excel data files
+            usecols_map: 可选，sheet名称到需要读取的列（read_excel的usecols）的映射
+            nrows_map: 可选，sheet名称到需要读取的行数（read_excel的nrows）的映射
+            use_cache: 是否使用磁盘上的解析缓存，False时每次都解析Excel
         """
         self.data_dir = data_dir
+        self.use_cache = use_cache
+        
+        # 按sheet限制读取范围，解析引擎可以提前停止，未配置的sheet完整读取
+        self.usecols_map = usecols_map or {}
+        self.nrows_map = nrows_map or {}
         self.data: Dict[str, pd.DataFrame] = {}
         self.file_paths = {
             "HSA Daily Plan": os.path.join(data_dir, "daily plan.xlsx"),
@@ -23,6 +76,39 @@ class DataLoader:
             "HSA Capacity": os.path.join(data_dir, "capacity .xlsx"),
             "Learning Curve": os.path.join(data_dir, "Learning Curve.xlsx")
         }
+        # 数据类型 -> 加载函数，每个函数只负责该类型特有的读取和处理，
+        # 公共的检查、错误处理在load_data中统一完成
+        self._loaders = {
+            "HSA Daily Plan": self._load_daily_plan,
+            "HSA FG EOH": self._load_fg_eoh,
+            "HSA Capacity": self._load_capacity,
+            "Learning Curve": self._load_learning_curve
+        }
+        # 文件路径 -> (源文件mtime, 已打开的工作簿)，同一文件的多个sheet共用一次打开
+        self._workbooks: Dict[str, Tuple[float, pd.ExcelFile]] = {}
+        # 数据类型 -> (源文件mtime, sheet名称列表)
+        self._sheet_names_cache: Dict[str, Tuple[float, List[str]]] = {}
+        # 文件路径 -> ((mtime, 大小), 源文件指纹)，文件未变化时不重复计算哈希
+        self._fingerprints: Dict[str, Tuple[Tuple[int, int], str]] = {}
+        # 文件路径 -> (stat时间, stat结果)，文件不存在时结果为None
+        self._stat_cache: Dict[str, Tuple[float, Optional[os.stat_result]]] = {}
+        # 数据类型 -> 上次成功加载时的源文件指纹，文件未变化时重复加载直接返回已处理的数据
+        self._loaded_fingerprints: Dict[str, str] = {}
+        # 缓存文件路径 -> (源文件指纹, DataFrame)，read_excel_cached的结果在进程内共用一份
+        self._excel_frames: Dict[str, Tuple[str, pd.DataFrame]] = {}
+        
+        # 辅助sheet定义：只在首次访问时才读取（键为存储后缀，值为sheet名称）
+        self._aux_sheets = {
+            "HSA Capacity": {
+                "Manual": "Manual",
+                "Special": "Special HSA PN",
+                "MinPkg": "Minimum packaging"
+            },
+            "Learning Curve": {
+                "Other": "Learning curve (2)",
+                "Shutdown": "Learning curve for shutdown"
+            }
+        }
         
     def clean_column_names(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -35,29 +121,401 @@ class DataLoader:
         Returns:
             清理后的DataFrame
         """
-        import datetime
-        
-        new_columns = []
-        for col in df.columns:
-            # 处理datetime对象
-            if isinstance(col, datetime.datetime):
-                # 格式化为 YYYY-MM-DD
-                new_columns.append(col.strftime('%Y-%m-%d'))
-            # 处理字符串格式的日期时间
-            elif isinstance(col, str):
-                # 匹配各种时间格式：
-                # '2025-03-02 00:00:00.1', '2025-03-02 00:00:00', '2025-03-02T00:00:00' 等
-                if re.match(r'\d{4}-\d{2}-\d{2}[\sT]\d{2}:\d{2}:\d{2}', col):
-                    date_part = col.split(' ')[0].split('T')[0]  # 提取日期部分
-                    new_columns.append(date_part)
-                else:
-                    new_columns.append(col)
-            else:
-                new_columns.append(col)
+        # 列名全部为日期时直接整体格式化
+        if isinstance(df.columns, pd.DatetimeIndex):
+            df.columns = df.columns.strftime('%Y-%m-%d').tolist()
+            return df
+        
+        columns = pd.Series(df.columns, dtype=object)
+        
+        # 找出需要格式化的列名：datetime对象，以及带时间部分的日期字符串
+        # 如 '2025-03-02 00:00:00.1', '2025-03-02 00:00:00', '2025-03-02T00:00:00' 等
+        # 字符串列名用pandas字符串方法整体筛选，避免把普通列名（如"Total"）误解析为日期；
+        # 长度不足的字符串不会参与正则匹配
+        column_types = columns.map(type)
+        date_mask = column_types.isin([datetime.datetime, pd.Timestamp])
+        is_str = column_types.eq(str)
+        if is_str.any():
+            str_columns = columns[is_str].astype(str)
+            long_enough = str_columns.str.len().ge(_DATE_COL_MIN_LEN)
+            # 旧版pandas中对象列的str.match结果为object类型，先转为NumPy布尔数组再写入布尔掩码，
+            # 避免写入不兼容类型的FutureWarning
+            matched = str_columns.where(long_enough, "").str.match(_DATE_COL_RE).to_numpy(dtype=bool)
+            date_mask[is_str] = long_enough.to_numpy(dtype=bool) & matched
+        
+        new_columns = columns
+        if date_mask.any():
+            # 一次性向量化解析，统一格式化为 YYYY-MM-DD
+            # 解析失败的（如非法日期）直接截取字符串的日期部分
+            parsed = pd.to_datetime(columns[date_mask], format='ISO8601', errors='coerce')
+            formatted = parsed.dt.strftime('%Y-%m-%d')
+            new_columns = columns.copy()
+            new_columns[date_mask] = formatted.where(
+                parsed.notna(), columns[date_mask].map(lambda col: str(col)[:10])
+            )
         
         # 创建新的DataFrame使用清理后的列名
-        df.columns = new_columns
+        df.columns = new_columns.tolist()
+        return df
+        
+    def _stat(self, file_path: str) -> Optional[os.stat_result]:
+        """
+        获取源文件的stat结果，在_STAT_TTL秒内复用上一次的结果
+        存在性检查和缓存新旧判断共用一次stat，连续刷新时不再重复系统调用
+        
+        Args:
+            file_path: Excel文件路径
+            
+        Returns:
+            stat结果，文件不存在时返回None
+        """
+        now = time.monotonic()
+        entry = self._stat_cache.get(file_path)
+        if entry is not None and now - entry[0] < _STAT_TTL:
+            return entry[1]
+        
+        try:
+            result = os.stat(file_path)
+        except OSError:
+            result = None
+        self._stat_cache[file_path] = (now, result)
+        return result
+    
+    @contextmanager
+    def _read_workbook(self, file_path: str) -> Iterator[Any]:
+        """
+        以内存映射方式打开整个xlsx文件
+        
+        xlsx是zip容器，直接按路径解析会产生大量小块的seek/read；
+        映射后calamine在打开时直接从页缓存读取内容，无需先复制到中间缓冲区。
+        openpyxl在打开后仍持续引用文件对象（且旧版本Python的mmap不支持seekable()），
+        因此退回为BytesIO；空文件无法映射，同样读入BytesIO
+        
+        Args:
+            file_path: Excel文件路径
+            
+        Yields:
+            可供pd.ExcelFile打开的文件对象，退出上下文后映射即被关闭
+        """
+        with open(file_path, "rb") as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                yield io.BytesIO(f.read())
+                return
+            
+            with mm:
+                if EXCEL_ENGINE == "calamine":
+                    yield mm
+                else:
+                    yield io.BytesIO(mm)
+    
+    def _get_workbook(self, file_path: str) -> pd.ExcelFile:
+        """
+        获取文件对应的已打开工作簿，同一文件只打开并解析zip目录、共享字符串一次，
+        之后读取其他sheet直接复用；源文件修改后重新打开
+        
+        工作簿内容已读入内存，不持有文件句柄，不会锁住源文件
+        
+        Args:
+            file_path: Excel文件路径
+            
+        Returns:
+            pd.ExcelFile对象
+        """
+        mtime = self._stat(file_path).st_mtime
+        entry = self._workbooks.get(file_path)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+        
+        if entry is not None:
+            entry[1].close()
+        
+        with self._read_workbook(file_path) as workbook:
+            xlsx = pd.ExcelFile(workbook, engine=EXCEL_ENGINE)
+        self._workbooks[file_path] = (mtime, xlsx)
+        return xlsx
+    
+    def _fingerprint(self, file_path: str) -> str:
+        """
+        计算源文件指纹：mtime、文件大小和文件前64KB内容的SHA1
+        
+        仅比较mtime新旧时，用旧备份覆盖源文件（保留了旧的mtime）会误命中缓存；
+        指纹任何一项变化都会使缓存失效
+        
+        Args:
+            file_path: Excel文件路径
+            
+        Returns:
+            指纹字符串
+        """
+        source_stat = self._stat(file_path)
+        stat_key = (source_stat.st_mtime_ns, source_stat.st_size)
+        entry = self._fingerprints.get(file_path)
+        if entry is not None and entry[0] == stat_key:
+            return entry[1]
+        
+        with open(file_path, "rb") as f:
+            digest = hashlib.sha1(f.read(65536)).hexdigest()
+        fingerprint = f"{stat_key[0]}-{stat_key[1]}-{digest}"
+        self._fingerprints[file_path] = (stat_key, fingerprint)
+        return fingerprint
+    
+    def _cache_path(self, file_path: str, sheet_name, read_options: Dict[str, Any]) -> str:
+        """
+        获取指定文件和sheet对应的解析缓存路径
+        
+        Args:
+            file_path: Excel文件路径
+            sheet_name: sheet名称或索引
+            read_options: 传给read_excel的usecols/nrows等参数，不同参数使用不同缓存
+            
+        Returns:
+            缓存文件路径
+        """
+        file_name = os.path.splitext(os.path.basename(file_path))[0].strip()
+        if read_options:
+            options_tag = f"{zlib.crc32(repr(sorted(read_options.items())).encode()):08x}"
+            return os.path.join(self.data_dir, ".cache", f"{file_name}.{sheet_name}.{options_tag}.pkl")
+        return os.path.join(self.data_dir, ".cache", f"{file_name}.{sheet_name}.pkl")
+    
+    def _parse_sheet(self, file_path: str, sheet_name, read_options: Dict[str, Any]) -> pd.DataFrame:
+        """
+        从工作簿解析单个sheet
+        
+        解析器逐列构造DataFrame，每列各占一个块；解析后按类型合并为少数几个二维块，
+        块内每列连续存放（列优先），跨列的数值运算一次处理整块，缓存中也保存合并后的结构
+        
+        Args:
+            file_path: Excel文件路径
+            sheet_name: sheet名称或索引
+            read_options: 传给解析的usecols/nrows等参数
+            
+        Returns:
+            sheet数据
+        """
+        df = self._get_workbook(file_path).parse(sheet_name=sheet_name, **read_options)
+        df._consolidate_inplace()
         return df
+    
+    def _read_sheet(self, file_path: str, sheet_name) -> pd.DataFrame:
+        """
+        读取单个sheet，优先使用磁盘缓存
+        
+        缓存中记录的源文件指纹与当前一致时直接读取缓存，跳过xlsx解析；
+        否则解析Excel并写入缓存，Excel修改后第一次加载会自动刷新缓存
+        
+        Args:
+            file_path: Excel文件路径
+            sheet_name: sheet名称或索引
+            
+        Returns:
+            sheet数据（原始解析结果，尚未做任何清理）
+        """
+        read_options = {}
+        if self.usecols_map.get(sheet_name) is not None:
+            read_options["usecols"] = self.usecols_map[sheet_name]
+        if self.nrows_map.get(sheet_name) is not None:
+            read_options["nrows"] = self.nrows_map[sheet_name]
+        
+        if not self.use_cache:
+            return self._parse_sheet(file_path, sheet_name, read_options)
+        
+        return self._cached(file_path, self._cache_path(file_path, sheet_name, read_options),
+                            lambda: self._parse_sheet(file_path, sheet_name, read_options))
+    
+    def _cached(self, file_path: str, cache_path: str, build: Callable[[], Any]) -> Any:
+        """
+        读取由源文件派生的结果，缓存中记录的源文件指纹与当前一致时直接返回缓存内容，
+        否则调用build重新生成并写入缓存
+        
+        Args:
+            file_path: 源Excel文件路径
+            cache_path: 缓存文件路径
+            build: 缓存未命中时生成结果的函数
+            
+        Returns:
+            缓存内容或build的结果
+        """
+        fingerprint = None
+        
+        try:
+            fingerprint = self._fingerprint(file_path)
+            if os.path.exists(cache_path):
+                # 缓存内容为 (源文件指纹, 结果)
+                cached = pd.read_pickle(cache_path)
+                if isinstance(cached, tuple) and cached[0] == fingerprint:
+                    return cached[1]
+        except Exception as e:
+            print(f"Error reading cache {cache_path}: {e}")
+        
+        result = build()
+        
+        # 缓存写入失败不影响正常加载
+        if fingerprint is not None:
+            try:
+                self._write_cache(cache_path, (fingerprint, result))
+            except Exception as e:
+                print(f"Error writing cache {cache_path}: {e}")
+        
+        return result
+        
+    def _write_cache(self, cache_path: str, content: Any) -> None:
+        """
+        原子地写入缓存文件：先写到同目录的临时文件，再用os.replace替换
+        
+        并行加载的线程或预览线程同时读取时，只会看到完整的旧缓存或新缓存，
+        不会读到写了一半的文件
+        
+        Args:
+            cache_path: 缓存文件路径
+            content: 要缓存的内容
+        """
+        cache_dir = os.path.dirname(cache_path)
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pd.to_pickle(content, f)
+            os.replace(temp_path, cache_path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        
+    def _ffill_columns(self, df: pd.DataFrame, columns: List[str]) -> None:
+        """
+        对指定列进行前向填充（原地修改）
+        
+        低基数文本列（产线、产品等）先factorize为整数编码，在编码上用NumPy完成
+        前向填充后直接构造category类型：填充不再逐个处理Python字符串对象，
+        同时减少内存占用，后续的等值比较和分组直接在整数编码上进行。
+        数值列使用pandas的ffill并保持原类型。
+        
+        Args:
+            df: 要处理的DataFrame
+            columns: 需要前向填充的列名
+        """
+        numeric_columns = [col for col in columns if pd.api.types.is_numeric_dtype(df[col])]
+        if numeric_columns:
+            df[numeric_columns] = df[numeric_columns].ffill()
+        
+        text_columns = [col for col in columns if col not in numeric_columns]
+        if text_columns:
+            # 各列的编码叠成一个二维数组，前向填充一次完成
+            factorized = [pd.factorize(df[col]) for col in text_columns]
+            filled = _ffill_codes(np.column_stack([codes for codes, _ in factorized]))
+            df[text_columns] = pd.DataFrame({
+                col: pd.Categorical.from_codes(filled[:, i], categories=uniques)
+                for i, (col, (_, uniques)) in enumerate(zip(text_columns, factorized))
+            }, index=df.index)
+        
+        # 列赋值会让BlockManager产生零散的块，这里原地合并同类型的块一次，
+        # 之后的索引和UI逐行遍历不必在多个块之间跳转
+        df._consolidate_inplace()
+        
+    def _downcast_numeric(self, df: pd.DataFrame) -> None:
+        """
+        无损压缩数值列的类型（原地修改）
+        
+        整数列压缩为能容纳全部值的最小整数类型；浮点列只有在全部值都能被float32精确表示时
+        才转为float32，保证数值和显示结果与float64完全一致
+        
+        Args:
+            df: 要处理的DataFrame
+        """
+        # 按列位置处理，每类数值列整体判断和转换一次，不逐列调用to_numeric
+        dtypes = df.dtypes.tolist()
+        int_positions = [i for i, dtype in enumerate(dtypes) if pd.api.types.is_integer_dtype(dtype)]
+        float_positions = [i for i, dtype in enumerate(dtypes) if dtype == np.float64]
+        
+        # 目标类型 -> 列位置
+        targets: Dict[Any, List[int]] = {}
+        
+        if int_positions:
+            int_block = df.iloc[:, int_positions]
+            for position, low, high in zip(int_positions, int_block.min().tolist(), int_block.max().tolist()):
+                for dtype in (np.int8, np.int16, np.int32):
+                    info = np.iinfo(dtype)
+                    if info.min <= low and high <= info.max:
+                        if dtype != dtypes[position]:
+                            targets.setdefault(dtype, []).append(position)
+                        break
+        
+        if float_positions:
+            values = df.iloc[:, float_positions].to_numpy(dtype=np.float64)
+            exact = ((values.astype(np.float32).astype(np.float64) == values) | np.isnan(values)).all(axis=0)
+            exact_positions = [position for position, ok in zip(float_positions, exact) if ok]
+            if exact_positions:
+                targets[np.float32] = exact_positions
+        
+        for dtype, positions in targets.items():
+            df.isetitem(positions, df.iloc[:, positions].astype(dtype))
+        if targets:
+            df._consolidate_inplace()
+    
+    def _categorize_text(self, df: pd.DataFrame) -> None:
+        """
+        将低基数的文本列转为category（原地修改）
+        
+        不同取值不超过行数一半的纯文本列按整数编码存储，重复的字符串只保存一份；
+        混有数字等其他类型的列保持不变
+        
+        Args:
+            df: 要处理的DataFrame
+        """
+        positions = []
+        for position, (_, column) in enumerate(df.items()):
+            if column.dtype == object or isinstance(column.dtype, pd.StringDtype):
+                if (pd.api.types.infer_dtype(column, skipna=True) == 'string'
+                        and column.nunique() <= len(column) // 2):
+                    positions.append(position)
+        
+        for position in positions:
+            df.isetitem(position, df.iloc[:, position].astype('category'))
+        if positions:
+            df._consolidate_inplace()
+    
+    def _process_daily_plan(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        处理Daily Plan sheet：清理列名，拆分表头与数据行，并对Line列前向填充
+        load_data和get_data_for_sheet共用此逻辑
+        
+        Args:
+            df: 从Excel读取的原始sheet数据
+            
+        Returns:
+            (表头DataFrame, 处理后的数据DataFrame)
+        """
+        # 清理列名中的时间部分
+        df = self.clean_column_names(df)
+        
+        # 清理数据 - 从第4行开始是实际数据（前3行是日期、班次和时段）
+        # 前3行保留为表头，但不参与前向填充
+        # 表头只有3行，复制成本可忽略，且避免视图持有整个原始DataFrame
+        headers = df.iloc[:3].copy()
+        
+        # 去掉末尾的全空行，避免在内存中保留无用的尾部区域
+        data_rows = df.iloc[3:]
+        non_empty = data_rows.notna().to_numpy().any(axis=1)
+        if non_empty.any():
+            data_rows = data_rows.iloc[:len(non_empty) - int(np.argmax(non_empty[::-1]))]
+        
+        # 数据行不再整体复制：启用写时复制后切片是延迟复制的视图，
+        # 下面只按列替换标识列，其余数值数据部分保持原样、与原始数据共享内存
+        processed_data = data_rows
+        
+        # Build Type、Part Number同样是低基数的标识列，存为category，
+        # 等值比较和去重在整数编码上完成，不再逐个处理Python字符串对象
+        for position in range(1, min(3, processed_data.shape[1])):
+            processed_data.isetitem(position, processed_data.iloc[:, position].astype('category'))
+        
+        # 对第一列（Line列）使用ffill来填充空值（这样可以让LCA等值填充到后面的行）
+        self._ffill_columns(processed_data, [processed_data.columns[0]])
+        
+        return headers, processed_data
         
     def load_data(self, data_type: str) -> Tuple[bool, str, Optional[pd.DataFrame]]:
         """
@@ -72,103 +530,139 @@ class DataLoader:
                 - Message describing the result
                 - DataFrame if successful, None otherwise
         """
-        if data_type not in self.file_paths:
+        if data_type not in self._loaders:
             return False, f"Unknown data type: {data_type}", None
             
         file_path = self.file_paths[data_type]
         
-        if not os.path.exists(file_path):
+        if self._stat(file_path) is None:
             return False, f"File not found: {file_path}", None
             
         try:
-            # Handle different data types with their specific loading logic
-            if data_type == "HSA Daily Plan":
-                # Daily Plan需要特殊处理，因为表头有多行
-                df = pd.read_excel(file_path, sheet_name=0)
-                
-                # 清理列名中的时间部分
-                df = self.clean_column_names(df)
-                
-                # 清理数据 - 从第4行开始是实际数据（前3行是日期、班次和时段）
-                # 前3行保留为表头，但不参与前向填充
-                headers = df.iloc[:3].copy()
-                data_rows = df.iloc[3:].copy()
-                
-                # 提取"Line", "Build Type", "Part Number"列，这些列需要前向填充
-                id_columns = data_rows.iloc[:, :3].copy()
-                # 使用ffill来填充Line列的空值（这样可以让LCA等值填充到后面的行）
-                id_columns['Line'] = id_columns['Line'].ffill()
-                
-                # 数值数据部分不应该有"Day"和"Night"，保持原样
-                value_columns = data_rows.iloc[:, 3:].copy()
-                
-                # 重新组合数据
-                processed_data = pd.concat([id_columns, value_columns], axis=1)
-                
-                # 保存处理后的数据
-                self.data[data_type] = processed_data
-                
-                # 同时保存表头信息，以便在UI中显示
-                self.data[f"{data_type}_headers"] = headers
-                
-                return True, f"Successfully loaded {data_type}", processed_data
-                
-            elif data_type == "HSA FG EOH":
-                df = pd.read_excel(file_path, sheet_name="HSA EOH")
-                self.data[data_type] = df
-                return True, f"Successfully loaded {data_type}", df
-                
-            elif data_type == "HSA Capacity":
-                # Load the LCA sheet which appears to be the main capacity data
-                df = pd.read_excel(file_path, sheet_name="LCA")
-                
-                # 特殊处理capacity表 - 只在特定列应用前向填充
-                # 通常只有Lines和Product列需要前向填充
-                columns_to_fill = ['Lines', 'Product']
-                for col in columns_to_fill:
-                    if col in df.columns:
-                        df[col] = df[col].ffill()
-                
-                # 保存原始数据（不进行全局前向填充）
-                self.data[data_type] = df
-                
-                # 加载其他sheet以供后续使用
-                manual_df = pd.read_excel(file_path, sheet_name="Manual")
-                special_df = pd.read_excel(file_path, sheet_name="Special HSA PN")
-                min_pkg_df = pd.read_excel(file_path, sheet_name="Minimum packaging")
-                
-                self.data[f"{data_type}_Manual"] = manual_df
-                self.data[f"{data_type}_Special"] = special_df
-                self.data[f"{data_type}_MinPkg"] = min_pkg_df
-                
-                return True, f"Successfully loaded {data_type}", df
-                
-            elif data_type == "Learning Curve":
-                # Load the conversion learning curve data
-                df = pd.read_excel(file_path, sheet_name="Learning curve for conversion")
-                
-                # 特殊处理Learning Curve表 - 只在特定列应用前向填充
-                # 通常只有Product列需要前向填充
-                columns_to_fill = ['Product1', 'Config', 'Head_Qty']
-                for col in columns_to_fill:
-                    if col in df.columns:
-                        df[col] = df[col].ffill()
-                
-                self.data[data_type] = df
-                
-                # 加载其他sheet以供后续使用
-                other_df = pd.read_excel(file_path, sheet_name="Learning curve (2)")
-                shutdown_df = pd.read_excel(file_path, sheet_name="Learning curve for shutdown")
-                
-                self.data[f"{data_type}_Other"] = other_df
-                self.data[f"{data_type}_Shutdown"] = shutdown_df
-                
-                return True, f"Successfully loaded {data_type}", df
-                
+            fingerprint = self._fingerprint(file_path)
+            if self._loaded_fingerprints.get(data_type) == fingerprint and data_type in self.data:
+                return True, f"Successfully loaded {data_type}", self.data[data_type]
+            
+            # 源文件已变化（或首次加载）：丢弃已读取的辅助sheet，下次访问时重新读取
+            for key in self._aux_sheets.get(data_type, {}):
+                self.data.pop(f"{data_type}_{key}", None)
+            
+            df = self._loaders[data_type](file_path)
+            self._loaded_fingerprints[data_type] = fingerprint
+            return True, f"Successfully loaded {data_type}", df
         except Exception as e:
             return False, f"Error loading {data_type}: {str(e)}", None
+    
+    def _load_daily_plan(self, file_path: str) -> pd.DataFrame:
+        """
+        加载Daily Plan，需要特殊处理，因为表头有多行
+        
+        Args:
+            file_path: Excel文件路径
+            
+        Returns:
+            处理后的数据DataFrame
+        """
+        df = self._read_sheet(file_path, 0)
+        
+        headers, processed_data = self._process_daily_plan(df)
+        
+        # 保存处理后的数据
+        self.data["HSA Daily Plan"] = processed_data
+        
+        # 同时保存表头信息，以便在UI中显示
+        self.data["HSA Daily Plan_headers"] = headers
+        
+        return processed_data
+    
+    def _load_fg_eoh(self, file_path: str) -> pd.DataFrame:
+        """
+        加载FG EOH的HSA EOH sheet
+        
+        Args:
+            file_path: Excel文件路径
+            
+        Returns:
+            sheet数据
+        """
+        df = self._read_sheet(file_path, "HSA EOH")
+        self._downcast_numeric(df)
+        self._categorize_text(df)
+        self.data["HSA FG EOH"] = df
+        return df
+    
+    def _load_capacity(self, file_path: str) -> pd.DataFrame:
+        """
+        加载Capacity的LCA sheet，其他sheet（Manual等）在首次通过get_data访问时再加载
+        
+        Args:
+            file_path: Excel文件路径
+            
+        Returns:
+            sheet数据
+        """
+        df = self._read_sheet(file_path, "LCA")
+        
+        # 特殊处理capacity表 - 只在特定列应用前向填充
+        # 通常只有Lines和Product列需要前向填充
+        columns_to_fill = [col for col in ['Lines', 'Product'] if col in df.columns]
+        if columns_to_fill:
+            self._ffill_columns(df, columns_to_fill)
+        self._downcast_numeric(df)
+        
+        # 保存原始数据（不进行全局前向填充）
+        self.data["HSA Capacity"] = df
+        return df
+    
+    def _load_learning_curve(self, file_path: str) -> pd.DataFrame:
+        """
+        加载conversion学习曲线，其他sheet在首次通过get_data访问时再加载
+        
+        Args:
+            file_path: Excel文件路径
+            
+        Returns:
+            sheet数据
+        """
+        df = self._read_sheet(file_path, "Learning curve for conversion")
+        
+        # 特殊处理Learning Curve表 - 只在特定列应用前向填充
+        # 通常只有Product列需要前向填充
+        columns_to_fill = [col for col in ['Product1', 'Config', 'Head_Qty'] if col in df.columns]
+        if columns_to_fill:
+            self._ffill_columns(df, columns_to_fill)
+        self._downcast_numeric(df)
+        
+        self.data["Learning Curve"] = df
+        return df
+    
+    def load_all(self, data_types: Optional[List[str]] = None,
+                 on_loaded: Optional[Callable[[str, Tuple[bool, str, Optional[pd.DataFrame]]], None]] = None
+                 ) -> Dict[str, Tuple[bool, str, Optional[pd.DataFrame]]]:
+        """
+        并行加载多个数据类型，各Excel文件互相独立，可以同时解析
+        
+        Args:
+            data_types: 要加载的数据类型列表，默认加载全部
+            on_loaded: 可选，每个数据类型加载完成时立即调用（在调用load_all的线程中），
+                       参数为 (数据类型, load_data的返回结果)
             
-        return False, "Unknown error occurred", None
+        Returns:
+            数据类型到load_data返回结果的映射
+        """
+        data_types = list(data_types or self.file_paths.keys())
+        if not data_types:
+            return {}
+        
+        results = {}
+        with ThreadPoolExecutor(max_workers=len(data_types)) as executor:
+            futures = {executor.submit(self.load_data, data_type): data_type for data_type in data_types}
+            for future in as_completed(futures):
+                data_type = futures[future]
+                results[data_type] = future.result()
+                if on_loaded is not None:
+                    on_loaded(data_type, results[data_type])
+        return {data_type: results[data_type] for data_type in data_types}
     
     def get_sheet_names(self, data_type: str) -> List[str]:
         """
@@ -184,13 +678,28 @@ class DataLoader:
             return []
             
         file_path = self.file_paths[data_type]
-        if not os.path.exists(file_path):
+        source_stat = self._stat(file_path)
+        if source_stat is None:
             return []
+        
+        # 文件未修改时直接返回上次的结果，下拉框反复刷新时不再打开工作簿
+        cached = self._sheet_names_cache.get(data_type)
+        if cached is not None and cached[0] == source_stat.st_mtime:
+            return list(cached[1])
             
         try:
-            # 动态获取Excel文件的所有sheet名称
-            xlsx = pd.ExcelFile(file_path)
-            return xlsx.sheet_names
+            # 动态获取Excel文件的所有sheet名称；sheet数据都已有缓存时，
+            # 名称列表同样从缓存读取，启动时无需打开工作簿
+            if self.use_cache:
+                # Excel的sheet名称中不能出现方括号，不会与sheet缓存文件重名
+                file_name = os.path.splitext(os.path.basename(file_path))[0].strip()
+                cache_path = os.path.join(self.data_dir, ".cache", f"{file_name}.[sheet_names].pkl")
+                sheet_names = self._cached(file_path, cache_path,
+                                           lambda: list(self._get_workbook(file_path).sheet_names))
+            else:
+                sheet_names = self._get_workbook(file_path).sheet_names
+            self._sheet_names_cache[data_type] = (source_stat.st_mtime, sheet_names)
+            return list(sheet_names)
         except Exception as e:
             print(f"Error getting sheet names for {data_type}: {e}")
             # 如果获取失败，使用备用的硬编码名称
@@ -213,9 +722,46 @@ class DataLoader:
             
         Returns:
             DataFrame if data is loaded, None otherwise
+            返回的是缓存中的DataFrame本身，启用写时复制后调用方的修改不会影响缓存
         """
+        if data_type not in self.data:
+            # 辅助sheet按需加载
+            for base_type, sheets in self._aux_sheets.items():
+                prefix = f"{base_type}_"
+                if data_type.startswith(prefix) and data_type[len(prefix):] in sheets:
+                    return self._get_aux(base_type, data_type[len(prefix):])
         return self.data.get(data_type)
     
+    def _get_aux(self, data_type: str, key: str) -> Optional[pd.DataFrame]:
+        """
+        获取辅助sheet数据，首次访问时从Excel读取并缓存
+        
+        Args:
+            data_type: 主数据类型（如 "HSA Capacity"）
+            key: 辅助sheet的存储后缀（如 "Manual"）
+            
+        Returns:
+            DataFrame if loaded successfully, None otherwise
+        """
+        storage_key = f"{data_type}_{key}"
+        if storage_key in self.data:
+            return self.data[storage_key]
+        
+        file_path = self.file_paths[data_type]
+        if self._stat(file_path) is None:
+            return None
+        
+        try:
+            df = self._read_sheet(file_path, self._aux_sheets[data_type][key])
+            # 辅助sheet只用于预览，同样压缩类型以减少常驻内存
+            self._downcast_numeric(df)
+            self._categorize_text(df)
+            self.data[storage_key] = df
+            return df
+        except Exception as e:
+            print(f"Error loading {storage_key}: {e}")
+            return None
+    
     def get_data_for_sheet(self, data_type: str, sheet_name: str) -> Optional[pd.DataFrame]:
         """
         根据数据类型和sheet名称获取相应的数据
@@ -239,26 +785,9 @@ class DataLoader:
             if sheet_key not in self.data:
                 file_path = self.file_paths[data_type]
                 try:
-                    df = pd.read_excel(file_path, sheet_name=sheet_name)
-                    
-                    # 清理列名 - 统一格式化时间列名
-                    df = self.clean_column_names(df)
-                    
-                    # 提取表头数据（前3行）
-                    headers = df.iloc[:3].copy()
-                    
-                    # 提取数据行（从第4行开始）
-                    data_rows = df.iloc[3:].copy()
+                    df = self._read_sheet(file_path, sheet_name)
                     
-                    # 处理前3列的ID信息
-                    id_columns = data_rows.iloc[:, :3].copy()
-                    id_columns.iloc[:, 0] = id_columns.iloc[:, 0].ffill()  # 对第一列（通常是Line列）进行前向填充
-                    
-                    # 数值数据部分
-                    value_columns = data_rows.iloc[:, 3:].copy()
-                    
-                    # 重新组合数据
-                    processed_data = pd.concat([id_columns, value_columns], axis=1)
+                    headers, processed_data = self._process_daily_plan(df)
                     
                     # 保存处理后的数据和表头
                     self.data[sheet_key] = processed_data
@@ -316,6 +845,40 @@ class DataLoader:
             return self.data.get(f"{sheet_key}_headers")
         
         return self.get_headers(data_type)
+    
+    def read_excel_cached(self, file_path: str, sheet_name=0, **read_options) -> pd.DataFrame:
+        """
+        按指定参数（如多级表头header=[0,1,2]）解析sheet，结果与read_excel相同
+        
+        与常规加载共用磁盘缓存：源文件指纹未变化时直接读取缓存，不再解析xlsx；
+        同一参数的结果在内存中只保留一份，EventManager和LCA处理器共用同一个DataFrame，
+        源文件变化后返回新的DataFrame对象，调用方可据此判断派生结果是否需要重算。
+        use_cache为False时每次都解析Excel
+        
+        Args:
+            file_path: Excel文件路径
+            sheet_name: sheet名称或索引
+            **read_options: 传给read_excel的参数
+            
+        Returns:
+            sheet数据，只读使用
+        """
+        if not self.use_cache:
+            return self._parse_sheet(file_path, sheet_name, read_options)
+        
+        cache_path = self._cache_path(file_path, sheet_name, read_options)
+        # 调用方每次都经由这里判断新旧，指纹必须基于最新的stat：
+        # 复用_STAT_TTL内的stat结果时，刚保存的修改会被当作未变化而返回旧数据
+        self._stat_cache.pop(file_path, None)
+        fingerprint = self._fingerprint(file_path)
+        entry = self._excel_frames.get(cache_path)
+        if entry is not None and entry[0] == fingerprint:
+            return entry[1]
+        
+        df = self._cached(file_path, cache_path,
+                          lambda: self._parse_sheet(file_path, sheet_name, read_options))
+        self._excel_frames[cache_path] = (fingerprint, df)
+        return df
         
     def get_available_data_types(self) -> List[str]:
         """
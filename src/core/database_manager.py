@@ -139,10 +139,12 @@ class DatabaseManager:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
-                # 生成事件ID
-                cursor.execute("SELECT COUNT(*) FROM events")
-                count = cursor.fetchone()[0]
-                event_id = f"EVT_{count + 1:04d}"
+                # 生成事件ID：取events表自增序列的下一个值，单调递增且不会因删除而重复，
+                # 也无需像COUNT(*)那样扫描整表
+                cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'events'")
+                row = cursor.fetchone()
+                last_seq = row[0] if row else 0
+                event_id = f"EVT_{last_seq + 1:04d}"
                 
                 # 添加元数据
                 current_time = datetime.now().isoformat()
@@ -220,6 +222,47 @@ class DatabaseManager:
             self.logger.error(f"获取事件列表失败: {str(e)}")
             return []
     
+    def _get_event_columns(self, status: str = "active") -> Dict[str, List[Any]]:
+        """
+        按列获取事件数据，解析每条记录时直接追加到对应列，不再生成逐行的字典列表
+        
+        Args:
+            status: 事件状态筛选
+            
+        Returns:
+            {字段名: 值列表}，列顺序与字段首次出现的顺序一致，缺失字段为None；无事件时为空字典
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT event_data FROM events 
+                    WHERE status = ? 
+                    ORDER BY created_time DESC
+                ''', (status,))
+                
+                columns: Dict[str, List[Any]] = {}
+                row_count = 0
+                for (raw_data,) in cursor:
+                    event_data = json.loads(raw_data)
+                    for key, value in event_data.items():
+                        column = columns.get(key)
+                        if column is None:
+                            # 新出现的字段，之前的行补None
+                            column = columns[key] = [None] * row_count
+                        column.append(value)
+                    row_count += 1
+                    # 本行缺少的字段补None，保持各列等长
+                    for column in columns.values():
+                        if len(column) < row_count:
+                            column.append(None)
+                
+                return columns
+                
+        except Exception as e:
+            self.logger.error(f"获取事件列表失败: {str(e)}")
+            return {}
+    
     def get_event_by_id(self, event_id: str) -> Optional[Dict[str, Any]]:
         """
         根据ID获取事件
@@ -416,14 +459,21 @@ class DatabaseManager:
             是否成功
         """
         try:
-            import pandas as pd
+            from openpyxl import Workbook
             
-            events = self.get_all_events()
-            if not events:
+            columns = self._get_event_columns()
+            if not columns:
                 return False
             
-            df = pd.DataFrame(events)
-            df.to_excel(file_path, index=False)
+            # 只写模式逐行流式写出，不构建DataFrame，也不在内存中保留整个工作簿的单元格
+            workbook = Workbook(write_only=True)
+            worksheet = workbook.create_sheet("Sheet1")
+            worksheet.append(list(columns))
+            for row in zip(*columns.values()):
+                # 嵌套字典等Excel不支持的值按文本写出（与pandas导出一致）
+                worksheet.append([value if value is None or isinstance(value, (str, int, float))
+                                  else str(value) for value in row])
+            workbook.save(file_path)
             self.logger.info(f"数据已导出到: {file_path}")
             return True
             
@@ -1,11 +1,213 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from types import MappingProxyType
+from typing import Callable, Dict, List, Any, Optional, Tuple
 import re
+import sys
 from .database_manager import DatabaseManager
 
+# Daily Plan表头中"1-Mar"格式日期的月份缩写
+_MONTH_MAP = {
+    'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04',
+    'May': '05', 'Jun': '06', 'Jul': '07', 'Aug': '08',
+    'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'
+}
+
+# 产线名称格式：F+数字
+_LINE_NAME_PATTERN = re.compile(r'^F\d+$')
+
+def _format_header_date(date_obj) -> Optional[str]:
+    """
+    将三级表头第一级的日期转换为YYYY-MM-DD格式
+    
+    Args:
+        date_obj: datetime对象或"1-Mar"格式的字符串
+        
+    Returns:
+        日期字符串，无法识别时返回None
+    """
+    if hasattr(date_obj, 'strftime'):
+        # datetime对象
+        return date_obj.strftime('%Y-%m-%d')
+    if isinstance(date_obj, str) and '-' in date_obj:
+        # 字符串格式，如"1-Mar"
+        parts = date_obj.split('-')
+        if len(parts) == 2 and parts[1] in _MONTH_MAP:
+            return f"2025-{_MONTH_MAP[parts[1]]}-{parts[0].zfill(2)}"
+    return None
+
+def _is_date_column(col: str) -> bool:
+    r"""
+    判断列名是否以YYYY-MM-DD格式开头（扁平化Daily Plan中的日期列）
+    
+    按固定位置逐字符检查，等价于re.match(r'\d{4}-\d{2}-\d{2}', col)
+    
+    Args:
+        col: 列名
+        
+    Returns:
+        是否为日期列
+    """
+    return (len(col) >= 10 and col[4] == '-' and col[7] == '-'
+            and col[0:4].isdecimal() and col[5:7].isdecimal() and col[8:10].isdecimal())
+
+# float()可接受的数字字符串（去除首尾空白后）除数字外可能的首字符：符号、小数点、inf/nan
+_NUMBER_LEAD_CHARS = frozenset("+-.iInN")
+
+def _parse_number(value: Any) -> Optional[float]:
+    """
+    将输入转换为浮点数，与float()的接受范围一致
+    
+    明显不是数字的字符串（空串、首字符不可能构成数字）直接返回None，不经过异常处理
+    
+    Args:
+        value: 输入值
+        
+    Returns:
+        浮点数，无法转换时返回None
+    """
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            return None
+        if text.isascii() and text.isdigit():
+            return float(text)
+        if not (text[0].isdecimal() or text[0] in _NUMBER_LEAD_CHARS):
+            return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+# 事件类型定义（只读，所有EventManager实例共享）
+_EVENT_TYPES = MappingProxyType({
+    "LCA产量损失": {
+        "levels": [
+            {"name": "选择影响日期", "type": "date", "source": "daily_plan_dates"},
+            {"name": "选择影响班次", "type": "dropdown", "source": "shifts"},
+            {"name": "选择产线", "type": "dropdown", "source": "production_lines"},
+            {"name": "确认产品PN", "type": "dropdown", "source": "product_pn"},
+            {"name": "已经损失的产量", "type": "number", "validation": "positive_number"},
+            {"name": "剩余修理时间", "type": "number", "validation": "positive_number"},
+        ],
+        "description": "LCA产线产量损失事件登记"
+    },
+    "物料情况": {
+        "levels": [
+            {"name": "选择影响日期", "type": "date", "source": "daily_plan_dates"},
+            {"name": "选择影响班次", "type": "dropdown", "source": "shifts"},
+            {"name": "选择产线", "type": "dropdown", "source": "production_lines"},
+            {"name": "确认产品PN", "type": "dropdown", "source": "product_pn"},
+            {"name": "填入影响数量", "type": "number", "validation": "positive_number"}
+        ],
+        "description": "物料供应问题事件登记"
+    },
+    "SBR信息": {
+        "levels": [
+            {"name": "选择影响日期", "type": "date", "source": "daily_plan_dates"},
+            {"name": "选择影响班次", "type": "dropdown", "source": "shifts"},
+            {"name": "选择产线", "type": "dropdown", "source": "production_lines"},
+            {"name": "操作类型", "type": "dropdown", "source": "sbr_operations", "branches": True}
+        ],
+        "branches": {
+            "全部取消": [],
+            "延期": [
+                {"name": "选择延期时间", "type": "dropdown", "source": "delay_options"},
+            ],
+            "部分取消": [
+                {"name": "输入取消数量", "type": "number", "validation": "positive_number"},
+            ],
+            "提前": [
+                {"name": "选择提前时间", "type": "dropdown", "source": "advance_options"},
+            ]
+        },
+        "description": "SBR生产信息变更事件登记"
+    },
+    "PM状态": {
+        "levels": [
+            {"name": "选择影响日期", "type": "date", "source": "daily_plan_dates"},
+            {"name": "选择影响班次", "type": "dropdown", "source": "shifts"},
+            {"name": "选择产线", "type": "dropdown", "source": "production_lines"},
+            {"name": "提前还是延期", "type": "dropdown", "source": "pm_operations", "branches": True}
+        ],
+        "branches": {
+            "提前": [
+                {"name": "选择提前时间", "type": "dropdown", "source": "advance_options"}
+            ],
+            "延期": [
+                {"name": "选择延期时间", "type": "dropdown", "source": "delay_options"}
+            ]
+        },
+        "description": "设备维护状态变更事件登记"
+    },
+    "Drive loading计划": {
+        "levels": [
+            {"name": "选择影响日期", "type": "date", "source": "daily_plan_dates"},
+            {"name": "选择影响班次", "type": "dropdown", "source": "shifts"},
+            {"name": "选择产线", "type": "dropdown", "source": "production_lines"},
+            {"name": "确认问题类型", "type": "dropdown", "source": "drive_operations", "branches": True}
+        ],
+        "branches": {
+            "日期提前": [
+                {"name": "选择提前时间", "type": "dropdown", "source": "advance_options"}
+            ],
+            "日期延期": [
+                {"name": "选择延期时间", "type": "dropdown", "source": "delay_options"}
+            ],
+            "数量减少": [
+                {"name": "输入减少数量", "type": "number", "validation": "positive_number"}
+            ],
+            "数量增加": [
+                {"name": "输入增加数量", "type": "number", "validation": "positive_number"}
+            ],
+            "换PN": [
+                {"name": "选择需要操作的PN", "type": "dropdown", "source": "product_pn"},
+                {"name": "选择需要转换的PN", "type": "dropdown", "source": "product_pn"}
+            ]
+        },
+        "description": "Drive loading计划调整事件登记"
+    }
+})
+
+# 数据源选项定义（只读，选项为元组，对外返回列表副本）
+_DATA_SOURCES = MappingProxyType({
+    "shifts": ("T1", "T2", "T3", "T4", "Day", "Night"),
+    "shift_count": ("一个班", "两个班", "三个班", "全部班次"),
+    "sbr_operations": ("全部取消", "延期", "部分取消", "提前"),
+    "pm_operations": ("提前", "延期"),
+    "drive_operations": ("日期提前", "日期延期", "数量减少", "数量增加", "换PN"),
+    "delay_options": ("一个班", "两个班", "三个班"),
+    "advance_options": ("一个班", "两个班", "三个班"),
+    "schedule_change_reasons": ("客户需求变更", "供应链调整", "产能优化", "设备维护", "紧急订单", "其他"),
+    "quantity_change_reasons": ("市场需求变化", "物料供应问题", "产能调整", "客户取消订单", "库存调整", "其他"),
+    "pn_change_scope": ("仅当前批次", "当日全部", "本周全部", "后续全部", "需要确认范围")
+})
+
+def _build_branch_fields(event_types) -> Dict[str, Dict]:
+    """
+    预先找出每个事件类型中决定分支的字段，并检查分支定义是否完整
+    
+    Args:
+        event_types: 事件类型定义
+        
+    Returns:
+        {事件类型: 分支字段配置}，只包含有分支的事件类型
+    """
+    branch_fields = {}
+    for event_type, config in event_types.items():
+        fields = [level for level in config["levels"] if level.get("branches")]
+        if config.get("branches") and not fields:
+            raise ValueError(f"事件类型 {event_type} 定义了分支，但没有分支字段")
+        if fields:
+            branch_fields[event_type] = fields[0]
+    return branch_fields
+
+# 各事件类型的分支字段（导入时计算一次）
+_BRANCH_FIELDS = MappingProxyType(_build_branch_fields(_EVENT_TYPES))
+
 class EventManager:
     """
     事件管理类，负责处理生产事件的录入、验证和管理
@@ -31,110 +233,53 @@ class EventManager:
         self.current_level = 0
         self.current_event_type = None
         
-        # 事件类型定义
-        self.event_types = {
-            "LCA产量损失": {
-                "levels": [
-                    {"name": "选择影响日期", "type": "date", "source": "daily_plan_dates"},
-                    {"name": "选择影响班次", "type": "dropdown", "source": "shifts"},
-                    {"name": "选择产线", "type": "dropdown", "source": "production_lines"},
-                    {"name": "确认产品PN", "type": "dropdown", "source": "product_pn"},
-                    {"name": "已经损失的产量", "type": "number", "validation": "positive_number"},
-                    {"name": "剩余修理时间", "type": "number", "validation": "positive_number"},
-                ],
-                "description": "LCA产线产量损失事件登记"
-            },
-            "物料情况": {
-                "levels": [
-                    {"name": "选择影响日期", "type": "date", "source": "daily_plan_dates"},
-                    {"name": "选择影响班次", "type": "dropdown", "source": "shifts"},
-                    {"name": "选择产线", "type": "dropdown", "source": "production_lines"},
-                    {"name": "确认产品PN", "type": "dropdown", "source": "product_pn"},
-                    {"name": "填入影响数量", "type": "number", "validation": "positive_number"}
-                ],
-                "description": "物料供应问题事件登记"
-            },
-            "SBR信息": {
-                "levels": [
-                    {"name": "选择影响日期", "type": "date", "source": "daily_plan_dates"},
-                    {"name": "选择影响班次", "type": "dropdown", "source": "shifts"},
-                    {"name": "选择产线", "type": "dropdown", "source": "production_lines"},
-                    {"name": "操作类型", "type": "dropdown", "source": "sbr_operations", "branches": True}
-                ],
-                "branches": {
-                    "全部取消": [],
-                    "延期": [
-                        {"name": "选择延期时间", "type": "dropdown", "source": "delay_options"},
-                    ],
-                    "部分取消": [
-                        {"name": "输入取消数量", "type": "number", "validation": "positive_number"},
-                    ],
-                    "提前": [
-                        {"name": "选择提前时间", "type": "dropdown", "source": "advance_options"},
-                    ]
-                },
-                "description": "SBR生产信息变更事件登记"
-            },
-            "PM状态": {
-                "levels": [
-                    {"name": "选择影响日期", "type": "date", "source": "daily_plan_dates"},
-                    {"name": "选择影响班次", "type": "dropdown", "source": "shifts"},
-                    {"name": "选择产线", "type": "dropdown", "source": "production_lines"},
-                    {"name": "提前还是延期", "type": "dropdown", "source": "pm_operations", "branches": True}
-                ],
-                "branches": {
-                    "提前": [
-                        {"name": "选择提前时间", "type": "dropdown", "source": "advance_options"}
-                    ],
-                    "延期": [
-                        {"name": "选择延期时间", "type": "dropdown", "source": "delay_options"}
-                    ]
-                },
-                "description": "设备维护状态变更事件登记"
-            },
-            "Drive loading计划": {
-                "levels": [
-                    {"name": "选择影响日期", "type": "date", "source": "daily_plan_dates"},
-                    {"name": "选择影响班次", "type": "dropdown", "source": "shifts"},
-                    {"name": "选择产线", "type": "dropdown", "source": "production_lines"},
-                    {"name": "确认问题类型", "type": "dropdown", "source": "drive_operations", "branches": True}
-                ],
-                "branches": {
-                    "日期提前": [
-                        {"name": "选择提前时间", "type": "dropdown", "source": "advance_options"}
-                    ],
-                    "日期延期": [
-                        {"name": "选择延期时间", "type": "dropdown", "source": "delay_options"}
-                    ],
-                    "数量减少": [
-                        {"name": "输入减少数量", "type": "number", "validation": "positive_number"}
-                    ],
-                    "数量增加": [
-                        {"name": "输入增加数量", "type": "number", "validation": "positive_number"}
-                    ],
-                    "换PN": [
-                        {"name": "选择需要操作的PN", "type": "dropdown", "source": "product_pn"},
-                        {"name": "选择需要转换的PN", "type": "dropdown", "source": "product_pn"}
-                    ]
-                },
-                "description": "Drive loading计划调整事件登记"
-            }
+        # 三级表头Daily Plan的解析结果 (DataFrame, 每列的日期)，供班次/产线/forecast查询共用
+        self._shift_plan_cache: Optional[Tuple[pd.DataFrame, List[Optional[str]]]] = None
+        
+        # 扁平化Daily Plan派生结果缓存（日期、产线、PN列表和计划产量），
+        # 键为 (查询类型, 参数...)；data_loader返回的Daily Plan对象变化（重新加载）时清空
+        self._plan_df: Optional[pd.DataFrame] = None
+        self._plan_is_empty = True
+        self._options_cache: Dict[Tuple, Any] = {}
+        
+        # LCA处理器，首次处理LCA事件时创建，之后复用其Daily Plan、FG EOH等解析缓存
+        self._lca_processor = None
+        
+        # 事件类型与数据源选项定义为模块级只读常量，所有实例共享
+        self.event_types = _EVENT_TYPES
+        self.data_sources = _DATA_SOURCES
+        
+        # 需要根据Daily Plan和上下文计算选项的数据源 {数据源: 处理函数(上下文)}
+        self._source_handlers: Dict[str, Callable[[Dict], List[str]]] = {
+            "daily_plan_dates": lambda context: self._get_daily_plan_dates(),
+            "shifts": self._get_shift_options,
+            "production_lines": lambda context: self._get_production_lines(
+                context.get("选择影响日期"), context.get("选择影响班次")),
+            "product_pn": lambda context: self._get_product_pn(
+                context.get("选择影响日期"), context.get("选择产线")),
         }
         
-        # 数据源选项定义
-        self.data_sources = {
-            "shifts": ["T1", "T2", "T3", "T4", "Day", "Night"],
-            "shift_count": ["一个班", "两个班", "三个班", "全部班次"],
-            "sbr_operations": ["全部取消", "延期", "部分取消", "提前"],
-            "pm_operations": ["提前", "延期"],
-            "drive_operations": ["日期提前", "日期延期", "数量减少", "数量增加", "换PN"],
-            "delay_options": ["一个班", "两个班", "三个班"],
-            "advance_options": ["一个班", "两个班", "三个班"],
-            "schedule_change_reasons": ["客户需求变更", "供应链调整", "产能优化", "设备维护", "紧急订单", "其他"],
-            "quantity_change_reasons": ["市场需求变化", "物料供应问题", "产能调整", "客户取消订单", "库存调整", "其他"],
-            "pn_change_scope": ["仅当前批次", "当日全部", "本周全部", "后续全部", "需要确认范围"]
+        # 各事件类型的逻辑验证函数 {事件类型: 验证函数(事件数据)}
+        self._event_validators: Dict[str, Callable[[Dict], Tuple[bool, str]]] = {
+            "LCA产量损失": self._validate_lca_loss_event,
+            "物料情况": self._validate_material_event,
+            "SBR信息": self._validate_sbr_event,
+            "PM状态": self._validate_pm_event,
+            "Drive loading计划": self._validate_drive_loading_event,
         }
         
+    def get_branch_field(self, event_type: str) -> Optional[Dict]:
+        """
+        获取事件类型中决定分支的字段配置
+        
+        Args:
+            event_type: 事件类型
+            
+        Returns:
+            分支字段配置，事件类型无分支时返回None
+        """
+        return _BRANCH_FIELDS.get(event_type)
+    
     def log_message(self, level: str, message: str):
         """记录日志消息"""
         if self.log_callback:
@@ -179,47 +324,123 @@ class EventManager:
         if context is None:
             context = self.current_event
             
-        if source == "daily_plan_dates":
-            return self._get_daily_plan_dates()
-        elif source == "shifts":
-            # 如果已选择日期，则根据日期从Daily Plan获取实际班次
-            selected_date = context.get("选择影响日期")
-            if selected_date:
-                return self._get_shifts_for_date(selected_date)
-            else:
-                # 如果没有选择日期，返回默认班次列表
-                return self.data_sources["shifts"]
-        elif source == "production_lines":
-            return self._get_production_lines(context.get("选择影响日期"), context.get("选择影响班次"))
-        elif source == "product_pn":
-            return self._get_product_pn(context.get("选择影响日期"), context.get("选择产线"))
-        elif source in self.data_sources:
-            return self.data_sources[source]
-        else:
-            self.log_message("WARNING", f"未知数据源: {source}")
-            return []
+        handler = self._source_handlers.get(source)
+        if handler is not None:
+            return handler(context)
+        if source in self.data_sources:
+            return list(self.data_sources[source])
+        
+        self.log_message("WARNING", f"未知数据源: {source}")
+        return []
+    
+    def _get_shift_options(self, context: Dict) -> List[str]:
+        """获取班次选项"""
+        # 如果已选择日期，则根据日期从Daily Plan获取实际班次
+        selected_date = context.get("选择影响日期")
+        if selected_date:
+            return self._get_shifts_for_date(selected_date)
+        # 如果没有选择日期，返回默认班次列表
+        return list(self.data_sources["shifts"])
+    
+    def _get_daily_plan_with_shifts(self) -> pd.DataFrame:
+        """
+        获取按三级表头(日期, 星期, 班次)解析的Daily Plan
+        
+        班次、产线和forecast查询都基于同一份解析结果，文件未修改时不再重复解析Excel
+        
+        Returns:
+            带三级表头的DataFrame，只读使用
+        """
+        return self._load_daily_plan_with_shifts()[0]
+    
+    def _get_shift_plan_column_dates(self) -> List[Optional[str]]:
+        """
+        获取三级表头Daily Plan每一列对应的日期（YYYY-MM-DD），与列一一对应
+        
+        Returns:
+            日期列表，非日期列为None
+        """
+        return self._load_daily_plan_with_shifts()[1]
+    
+    def _load_daily_plan_with_shifts(self) -> Tuple[pd.DataFrame, List[Optional[str]]]:
+        """
+        解析三级表头Daily Plan并预先转换各列日期，文件未修改时直接返回缓存
+        
+        新旧判断交给数据加载器：源文件未变化时read_excel_cached返回同一个DataFrame对象，
+        只有返回新对象时才重新转换各列日期
+        
+        Returns:
+            (带三级表头的DataFrame, 每列的日期)
+        """
+        # 经由数据加载器读取，与LCA处理器共用同一份解析结果和磁盘缓存
+        df = self.data_loader.read_excel_cached(self.data_loader.file_paths["HSA Daily Plan"],
+                                                sheet_name=0, header=[0,1,2])
+        if self._shift_plan_cache is None or self._shift_plan_cache[0] is not df:
+            column_dates: List[Optional[str]] = [None] * len(df.columns)
+            if isinstance(df.columns, pd.MultiIndex) and df.columns.nlevels >= 3:
+                # 每个不同的日期表头只转换一次，再按编码映射回各列
+                codes, uniques = pd.factorize(df.columns.get_level_values(0), use_na_sentinel=False)
+                formatted = [_format_header_date(date_obj) for date_obj in uniques]
+                column_dates = [formatted[code] for code in codes]
+            self._shift_plan_cache = (df, column_dates)
+        return self._shift_plan_cache
+    
+    def _get_plan_df(self) -> Optional[pd.DataFrame]:
+        """
+        获取扁平化的Daily Plan，数据重新加载（对象变化）时清空派生结果缓存
+        
+        空表在此统一视为无数据，各计算函数只需判断None
+        
+        Returns:
+            Daily Plan DataFrame，未加载或为空时返回None
+        """
+        data = self.data_loader.get_data("HSA Daily Plan")
+        if data is not self._plan_df:
+            self._plan_df = data
+            self._plan_is_empty = data is None or data.empty
+            self._options_cache.clear()
+        return None if self._plan_is_empty else data
+    
+    def _cached_plan_result(self, key: Tuple, compute: Callable[[Optional[pd.DataFrame]], Any]) -> Any:
+        """
+        按键缓存由扁平化Daily Plan计算出的结果，同一份数据只计算一次
+        
+        Args:
+            key: 缓存键 (查询类型, 参数...)
+            compute: 未命中时调用的函数，参数为Daily Plan DataFrame
+            
+        Returns:
+            缓存或新计算的结果
+        """
+        data = self._get_plan_df()
+        if key not in self._options_cache:
+            self._options_cache[key] = compute(data)
+        return self._options_cache[key]
     
     def _get_daily_plan_dates(self) -> List[str]:
         """获取Daily Plan中的可用日期"""
         try:
-            data = self.data_loader.get_data("HSA Daily Plan")
-            if data is None or data.empty:
+            date_list = self._cached_plan_result(("dates",), self._compute_daily_plan_dates)
+            if date_list is None:
                 return []
             
-            # 从列名中提取日期，并去重
-            date_set = set()
-            for col in data.columns:
-                if isinstance(col, str) and re.match(r'\d{4}-\d{2}-\d{2}', col):
-                    date_set.add(col)
-            
-            # 转换为排序的列表
-            date_list = sorted(list(date_set))
             self.log_message("INFO", f"找到 {len(date_list)} 个可用日期")
-            return date_list
+            return list(date_list)
         except Exception as e:
             self.log_message("ERROR", f"获取日期列表时出错: {str(e)}")
             return []
     
+    def _compute_daily_plan_dates(self, data: Optional[pd.DataFrame]) -> Optional[List[str]]:
+        """从Daily Plan列名中提取排序后的日期列表，没有数据时返回None"""
+        if data is None:
+            return None
+        
+        # 从列名中提取日期，并去重
+        date_set = {col for col in data.columns if isinstance(col, str) and _is_date_column(col)}
+        
+        # YYYY-MM-DD字符串的字典序即日期顺序，直接排序，无需转换为日期类型
+        return sorted(date_set)
+    
     def _get_shifts_for_date(self, date: str) -> List[str]:
         """
         根据指定日期从Daily Plan获取该日期实际存在的班次
@@ -231,42 +452,17 @@ class EventManager:
             该日期存在的班次列表
         """
         try:
-            # 直接读取Excel文件以获取三级表头信息
-            file_path = "data/daily plan.xlsx"
-            df_with_shifts = pd.read_excel(file_path, sheet_name=0, header=[0,1,2])
+            # 获取带三级表头信息的Daily Plan
+            df_with_shifts = self._get_daily_plan_with_shifts()
             
             # 提取指定日期的班次
             available_shifts = set()
             
-            for col in df_with_shifts.columns:
-                if isinstance(col, tuple) and len(col) >= 3:
-                    # 三级表头格式：(日期, 星期, 班次)
-                    date_obj = col[0]
-                    shift = col[2]
-                    
-                    # 处理日期格式转换
-                    formatted_date = None
-                    if hasattr(date_obj, 'strftime'):
-                        # datetime对象
-                        formatted_date = date_obj.strftime('%Y-%m-%d')
-                    elif isinstance(date_obj, str):
-                        # 字符串格式，如"1-Mar"
-                        if '-' in date_obj:
-                            try:
-                                day, month = date_obj.split('-')
-                                month_map = {
-                                    'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04',
-                                    'May': '05', 'Jun': '06', 'Jul': '07', 'Aug': '08', 
-                                    'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'
-                                }
-                                if month in month_map:
-                                    formatted_date = f"2025-{month_map[month]}-{day.zfill(2)}"
-                            except:
-                                continue
-                    
-                    # 如果日期匹配且是有效班次，添加到集合中
-                    if formatted_date == date and shift in ['T1', 'T2', 'T3', 'T4']:
-                        available_shifts.add(shift)
+            for col, formatted_date in zip(df_with_shifts.columns, self._get_shift_plan_column_dates()):
+                # 三级表头格式：(日期, 星期, 班次)，日期已预先转换为YYYY-MM-DD
+                # 如果日期匹配且是有效班次，添加到集合中
+                if formatted_date == date and col[2] in ['T1', 'T2', 'T3', 'T4']:
+                    available_shifts.add(col[2])
             
             # 按班次顺序排序
             shift_order = ['T1', 'T2', 'T3', 'T4']
@@ -278,7 +474,7 @@ class EventManager:
         except Exception as e:
             self.log_message("ERROR", f"获取日期 {date} 的班次时出错: {str(e)}")
             # 出错时返回默认班次列表
-            return self.data_sources["shifts"]
+            return list(self.data_sources["shifts"])
     
     def _get_production_lines(self, date: str = None, shift: str = None) -> List[str]:
         """
@@ -297,20 +493,23 @@ class EventManager:
                 return self._get_lines_for_date_shift(date, shift)
             
             # 否则从扁平化的Daily Plan获取所有生产线
-            data = self.data_loader.get_data("HSA Daily Plan")
-            if data is None or data.empty:
-                return []
-            
-            # 从第一列（Line列）获取生产线
-            lines = data.iloc[:, 0].dropna().unique().tolist()
-            # 过滤掉空值和非字符串值，并且只保留F+数字格式的产线
-            lines = [str(line) for line in lines if pd.notna(line) and str(line).strip() and re.match(r'^F\d+$', str(line).strip())]
-            
-            return sorted(lines)
+            return list(self._cached_plan_result(("lines",), self._compute_all_production_lines))
         except Exception as e:
             self.log_message("ERROR", f"获取生产线列表时出错: {str(e)}")
             return []
     
+    def _compute_all_production_lines(self, data: Optional[pd.DataFrame]) -> List[str]:
+        """从Daily Plan第一列（Line列）提取排序后的F+数字格式产线"""
+        if data is None:
+            return []
+        
+        # 从第一列（Line列）获取生产线
+        lines = data.iloc[:, 0].dropna().unique().tolist()
+        # 过滤掉空值和非字符串值，并且只保留F+数字格式的产线
+        lines = [sys.intern(str(line)) for line in lines if pd.notna(line) and str(line).strip() and _LINE_NAME_PATTERN.match(str(line).strip())]
+        
+        return sorted(lines)
+    
     def _get_lines_for_date_shift(self, date: str, shift: str) -> List[str]:
         """
         根据指定日期和班次从Daily Plan获取有生产计划的产线列表
@@ -323,38 +522,16 @@ class EventManager:
             该日期班次有生产计划的产线列表
         """
         try:
-            # 直接读取Excel文件以获取三级表头信息
-            file_path = "data/daily plan.xlsx"
-            df_with_shifts = pd.read_excel(file_path, sheet_name=0, header=[0,1,2])
+            # 获取带三级表头信息的Daily Plan
+            df_with_shifts = self._get_daily_plan_with_shifts()
             
             # 找到匹配日期和班次的列
             target_column = None
-            for col in df_with_shifts.columns:
-                if isinstance(col, tuple) and len(col) >= 3:
-                    date_obj = col[0]
-                    col_shift = col[2]
-                    
-                    # 处理日期格式转换
-                    formatted_date = None
-                    if hasattr(date_obj, 'strftime'):
-                        formatted_date = date_obj.strftime('%Y-%m-%d')
-                    elif isinstance(date_obj, str) and '-' in date_obj:
-                        try:
-                            day, month = date_obj.split('-')
-                            month_map = {
-                                'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04',
-                                'May': '05', 'Jun': '06', 'Jul': '07', 'Aug': '08', 
-                                'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'
-                            }
-                            if month in month_map:
-                                formatted_date = f"2025-{month_map[month]}-{day.zfill(2)}"
-                        except:
-                            continue
-                    
-                    # 找到匹配的日期和班次列
-                    if formatted_date == date and col_shift == shift:
-                        target_column = col
-                        break
+            for col, formatted_date in zip(df_with_shifts.columns, self._get_shift_plan_column_dates()):
+                # 日期已预先转换为YYYY-MM-DD，col[2]为班次
+                if formatted_date == date and col[2] == shift:
+                    target_column = col
+                    break
             
             if target_column is None:
                 self.log_message("WARNING", f"未找到 {date} {shift} 对应的数据列")
@@ -396,8 +573,8 @@ class EventManager:
                     line_str = str(line_name).strip()
                     
                     # 只包含F+数字格式的产线（实际生产线，如F16, F25等）
-                    if (re.match(r'^F\d+$', line_str) and line_str not in lines_with_data):
-                        lines_with_data.append(line_str)
+                    if (_LINE_NAME_PATTERN.match(line_str) and line_str not in lines_with_data):
+                        lines_with_data.append(sys.intern(line_str))
             
             result = sorted(lines_with_data)
             self.log_message("INFO", f"日期 {date} 班次 {shift} 的可用产线: {result}")
@@ -411,28 +588,29 @@ class EventManager:
     def _get_product_pn(self, date: str = None, line: str = None) -> List[str]:
         """根据日期和生产线获取产品PN列表"""
         try:
-            data = self.data_loader.get_data("HSA Daily Plan")
-            if data is None or data.empty:
-                return []
-            
-            # 如果指定了生产线，过滤对应的行
-            if line:
-                line_data = data[data.iloc[:, 0] == line]
-                if not line_data.empty:
-                    # 从第三列（Part Number列）获取产品PN
-                    pns = line_data.iloc[:, 2].dropna().unique().tolist()
-                    pns = [str(pn) for pn in pns if pd.notna(pn) and str(pn).strip()]
-                    return sorted(pns)
-            
-            # 如果没有指定生产线，返回所有产品PN
-            pns = data.iloc[:, 2].dropna().unique().tolist()
-            pns = [str(pn) for pn in pns if pd.notna(pn) and str(pn).strip()]
-            
-            return sorted(pns)
+            # PN列表与日期无关，按产线缓存
+            return list(self._cached_plan_result(("pn", line), lambda data: self._compute_product_pn(data, line)))
         except Exception as e:
             self.log_message("ERROR", f"获取产品PN列表时出错: {str(e)}")
             return []
     
+    def _compute_product_pn(self, data: Optional[pd.DataFrame], line: Optional[str]) -> List[str]:
+        """从Daily Plan第三列（Part Number列）提取指定产线（未指定时为全部）排序后的PN"""
+        if data is None:
+            return []
+        
+        # 如果指定了生产线，取该产线的PN（各产线的PN一次分组得到）
+        if line:
+            line_pns = self._cached_plan_result(("pn_by_line",), self._compute_pn_by_line).get(line)
+            if line_pns is not None:
+                return line_pns
+        
+        # 如果没有指定生产线，返回所有产品PN
+        pns = data.iloc[:, 2].dropna().unique().tolist()
+        pns = [sys.intern(str(pn)) for pn in pns if pd.notna(pn) and str(pn).strip()]
+        
+        return sorted(pns)
+    
     def validate_input(self, validation_type: str, value: Any) -> Tuple[bool, str]:
         """
         验证用户输入
@@ -445,13 +623,12 @@ class EventManager:
             (是否有效, 错误消息)
         """
         if validation_type == "positive_number":
-            try:
-                num = float(value)
-                if num <= 0:
-                    return False, "数值必须大于0"
-                return True, ""
-            except ValueError:
+            num = _parse_number(value)
+            if num is None:
                 return False, "请输入有效的数字"
+            if num <= 0:
+                return False, "数值必须大于0"
+            return True, ""
         
         return True, ""
     
@@ -472,16 +649,9 @@ class EventManager:
             return False, "事件类型不能为空"
         
         # 根据事件类型进行特定验证
-        if event_type == "LCA产量损失":
-            return self._validate_lca_loss_event(event_data)
-        elif event_type == "物料情况":
-            return self._validate_material_event(event_data)
-        elif event_type == "SBR信息":
-            return self._validate_sbr_event(event_data)
-        elif event_type == "PM状态":
-            return self._validate_pm_event(event_data)
-        elif event_type == "Drive loading计划":
-            return self._validate_drive_loading_event(event_data)
+        validator = self._event_validators.get(event_type)
+        if validator is not None:
+            return validator(event_data)
         
         return True, ""
     
@@ -540,19 +710,8 @@ class EventManager:
     def _get_planned_quantity(self, date: str, line: str, pn: str) -> Optional[float]:
         """获取指定日期、生产线和产品的计划产量"""
         try:
-            data = self.data_loader.get_data("HSA Daily Plan")
-            if data is None or data.empty:
-                return None
-            
-            # 过滤指定生产线和产品的数据
-            filtered_data = data[(data.iloc[:, 0] == line) & (data.iloc[:, 2] == pn)]
-            
-            if not filtered_data.empty and date in filtered_data.columns:
-                qty = filtered_data[date].iloc[0]
-                if pd.notna(qty):
-                    return float(qty)
-            
-            return None
+            return self._cached_plan_result(("planned", date, line, pn),
+                                            lambda data: self._compute_planned_quantity(data, date, line, pn))
         except Exception as e:
             self.log_message("ERROR", f"获取计划产量时出错: {str(e)}")
             return None
@@ -560,22 +719,121 @@ class EventManager:
     def _get_total_planned_quantity(self, date: str, line: str) -> Optional[float]:
         """获取指定日期和生产线的总计划产量"""
         try:
-            data = self.data_loader.get_data("HSA Daily Plan")
-            if data is None or data.empty:
-                return None
+            return self._cached_plan_result(("total", date, line),
+                                            lambda data: self._compute_total_planned_quantity(data, date, line))
+        except Exception as e:
+            self.log_message("ERROR", f"获取总计划产量时出错: {str(e)}")
+            return None
+    
+    def _compute_key_codes(self, data: Optional[pd.DataFrame]) -> Tuple[np.ndarray, List[Any], np.ndarray, List[Any]]:
+        """
+        将第一列（Line列）和第三列（Part Number列）各编码为整数，产线/PN索引都基于编码构建，不再逐个比较对象值
+        
+        Args:
+            data: 扁平化的Daily Plan
             
-            # 过滤指定生产线的数据
-            filtered_data = data[data.iloc[:, 0] == line]
+        Returns:
+            (产线编码, 产线值列表, PN编码, PN值列表)，空值编码为-1
+        """
+        if data is None:
+            return np.empty(0, dtype=np.intp), [], np.empty(0, dtype=np.intp), []
+        
+        line_codes, line_values = pd.factorize(data.iloc[:, 0])
+        pn_codes, pn_values = pd.factorize(data.iloc[:, 2])
+        return line_codes, list(line_values), pn_codes, list(pn_values)
+    
+    def _compute_pn_by_line(self, data: Optional[pd.DataFrame]) -> Dict[Any, List[str]]:
+        """
+        按产线编码和PN编码的组合去重，得到每个产线排序后的PN
+        
+        同一PN在多个产线中出现时共享同一个驻留字符串对象
+        
+        Args:
+            data: 扁平化的Daily Plan
             
-            if not filtered_data.empty and date in filtered_data.columns:
-                total_qty = filtered_data[date].sum()
-                if pd.notna(total_qty):
-                    return float(total_qty)
+        Returns:
+            {产线: PN列表}，只包含Daily Plan中出现过的产线
+        """
+        if data is None:
+            return {}
+        
+        line_codes, line_values, pn_codes, pn_values = self._cached_plan_result(("key_codes",), self._compute_key_codes)
+        pn_by_line = {line: [] for line in line_values}
+        
+        # 产线、PN都非空的行按 (产线编码, PN编码) 组合去重
+        valid = (line_codes >= 0) & (pn_codes >= 0)
+        pn_count = len(pn_values)
+        pairs = np.unique(line_codes[valid].astype(np.int64) * pn_count + pn_codes[valid])
+        for pair in pairs.tolist():
+            line_code, pn_code = divmod(pair, pn_count)
+            pn = str(pn_values[pn_code])
+            if pn.strip():
+                pn_by_line[line_values[line_code]].append(sys.intern(pn))
+        
+        for pns in pn_by_line.values():
+            pns.sort()
+        return pn_by_line
+    
+    def _compute_row_index(self, data: Optional[pd.DataFrame]) -> Tuple[Dict[Tuple[Any, Any], int], Dict[Any, np.ndarray]]:
+        """
+        按产线编码和PN编码建立行位置索引，查询计划产量时直接定位行，无需逐行比较
+        
+        Args:
+            data: 扁平化的Daily Plan
             
+        Returns:
+            ({(产线, PN): 首个匹配行位置}, {产线: 行位置数组})
+        """
+        if data is None:
+            return {}, {}
+        
+        line_codes, line_values, pn_codes, pn_values = self._cached_plan_result(("key_codes",), self._compute_key_codes)
+        
+        # 稳定排序后按产线编码切分，每个产线的行位置保持原顺序；空产线（-1）排在最前，跳过
+        order = np.argsort(line_codes, kind="stable")
+        valid_line = line_codes >= 0
+        counts = np.bincount(line_codes[valid_line], minlength=len(line_values))
+        positions = order[np.count_nonzero(~valid_line):]
+        rows_by_line = dict(zip(line_values, np.split(positions, np.cumsum(counts)[:-1])))
+        
+        # 每个 (产线, PN) 组合首次出现的行
+        rows = np.flatnonzero(valid_line & (pn_codes >= 0))
+        pn_count = len(pn_values)
+        pairs, first = np.unique(line_codes[rows].astype(np.int64) * pn_count + pn_codes[rows], return_index=True)
+        rows_by_line_pn = {}
+        for pair, row in zip(pairs.tolist(), rows[first].tolist()):
+            line_code, pn_code = divmod(pair, pn_count)
+            rows_by_line_pn[(line_values[line_code], pn_values[pn_code])] = row
+        
+        return rows_by_line_pn, rows_by_line
+    
+    def _compute_planned_quantity(self, data: Optional[pd.DataFrame], date: str, line: str, pn: str) -> Optional[float]:
+        """在Daily Plan中查找指定日期、生产线和产品的计划产量"""
+        if data is None or date not in data.columns:
             return None
-        except Exception as e:
-            self.log_message("ERROR", f"获取总计划产量时出错: {str(e)}")
+        
+        rows_by_line_pn, _ = self._cached_plan_result(("row_index",), self._compute_row_index)
+        row = rows_by_line_pn.get((line, pn))
+        if row is not None:
+            qty = data[date].iloc[row]
+            if pd.notna(qty):
+                return float(qty)
+        
+        return None
+    
+    def _compute_total_planned_quantity(self, data: Optional[pd.DataFrame], date: str, line: str) -> Optional[float]:
+        """在Daily Plan中汇总指定日期和生产线的计划产量"""
+        if data is None or date not in data.columns:
             return None
+        
+        _, rows_by_line = self._cached_plan_result(("row_index",), self._compute_row_index)
+        rows = rows_by_line.get(line)
+        if rows is not None:
+            total_qty = data[date].iloc[rows].sum()
+            if pd.notna(total_qty):
+                return float(total_qty)
+        
+        return None
     
     def create_event(self, event_data: Dict) -> Tuple[bool, str]:
         """
@@ -687,8 +945,10 @@ class EventManager:
             # 创建LCA处理器并执行处理
             from .lca_capacity_loss import LCACapacityLossProcessor
             
-            # 创建LCA处理器，使用适配器传递日志
-            lca_processor = LCACapacityLossProcessor(self.data_loader, self._create_logger())
+            # 创建LCA处理器，使用适配器传递日志（只创建一次，跨事件复用）
+            if self._lca_processor is None:
+                self._lca_processor = LCACapacityLossProcessor(self.data_loader, self._create_logger())
+            lca_processor = self._lca_processor
             
             # 执行LCA处理逻辑
             result = lca_processor.process_lca_capacity_loss(event_data)
@@ -752,38 +1012,16 @@ class EventManager:
             forecast值，如果未找到返回0.0
         """
         try:
-            # 直接读取Excel文件以获取三级表头信息
-            file_path = "data/daily plan.xlsx"
-            df_with_shifts = pd.read_excel(file_path, sheet_name=0, header=[0,1,2])
+            # 获取带三级表头信息的Daily Plan
+            df_with_shifts = self._get_daily_plan_with_shifts()
             
             # 找到目标日期和班次对应的列
             target_column = None
-            for col in df_with_shifts.columns:
-                if isinstance(col, tuple) and len(col) >= 3:
-                    date_obj = col[0]
-                    col_shift = col[2]
-                    
-                    # 处理日期格式转换
-                    formatted_date = None
-                    if hasattr(date_obj, 'strftime'):
-                        formatted_date = date_obj.strftime('%Y-%m-%d')
-                    elif isinstance(date_obj, str) and '-' in date_obj:
-                        try:
-                            day, month = date_obj.split('-')
-                            month_map = {
-                                'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04',
-                                'May': '05', 'Jun': '06', 'Jul': '07', 'Aug': '08', 
-                                'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'
-                            }
-                            if month in month_map:
-                                formatted_date = f"2025-{month_map[month]}-{day.zfill(2)}"
-                        except:
-                            continue
-                    
-                    # 找到匹配的日期和班次列
-                    if formatted_date == date and col_shift == shift:
-                        target_column = col
-                        break
+            for col, formatted_date in zip(df_with_shifts.columns, self._get_shift_plan_column_dates()):
+                # 日期已预先转换为YYYY-MM-DD，col[2]为班次
+                if formatted_date == date and col[2] == shift:
+                    target_column = col
+                    break
             
             if target_column is None:
                 self.log_message("WARNING", f"未找到 {date} {shift} 对应的数据列")
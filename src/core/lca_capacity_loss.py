@@ -6,11 +6,15 @@ LCA Capacity Loss Processing Module - Clean Version
 只包含前3个班次损失检查逻辑
 """
 
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Tuple, Optional
 import logging
 import os
+import re
+
+from .data_loader import EXCEL_ENGINE
 
 # 导入新的日志包
 try:
@@ -19,6 +23,23 @@ try:
 except ImportError:
     USE_NEW_LOGGING = False
 
+# F系列产线标识：包含 F10 ~ F49 中任意一个
+_F_LINE_PATTERN = re.compile(r"F[1-4][0-9]")
+
+# 统计班次事件时识别的事件类型（按顺序匹配Line列文本）
+_SHIFT_EVENT_TYPES = ("LCA", "Manual", "Recycle HGA", "PM")
+
+# 计算G值只用到的FG EOH列（表头可能带多余空格，TTL QTY中间可能有两个空格）
+_FG_EOH_COLUMNS = frozenset({"Product", "Head_Qty", "P/N", "TTL QTY", "TTL  QTY"})
+
+# 产能数据中找不到产线时使用的默认产能，可以根据产线类型设置不同的默认值
+_DEFAULT_LINE_CAPACITIES = {
+    "F16": 6000,
+    "F25": 7000,
+    "F29": 8000,
+    "F32": 7500
+}
+
 
 class LCACapacityLossProcessor:
     """
@@ -50,6 +71,22 @@ class LCACapacityLossProcessor:
         from .database_manager import DatabaseManager
         self.db_manager = DatabaseManager("data/events.db", self.logger)
         
+        # 最近一次取得的三级表头Daily Plan，仅用于判断数据加载器是否返回了新解析的结果
+        self._daily_plan_cache: Optional[pd.DataFrame] = None
+        
+        # FG EOH缓存：(文件修改时间, DataFrame)，以及按 (Product, Head_Qty) 分组的行位置
+        self._fg_eoh_cache: Optional[Tuple[float, pd.DataFrame]] = None
+        self._fg_eoh_groups: Optional[Tuple[pd.DataFrame, Dict[Tuple[Any, Any], np.ndarray]]] = None
+        
+        # 产线产能查询结果缓存：(产能数据对象, {产线: 产能})，产能数据重新加载后失效
+        self._line_capacity_cache: Optional[Tuple[Optional[pd.DataFrame], Dict[str, float]]] = None
+        
+        # 产线范围内的事件行缓存：(Daily Plan, {产线: [(行位置, 事件类型, Line列文本), ...]})
+        self._event_rows_cache: Optional[Tuple[pd.DataFrame, Dict[str, List[Tuple[int, str, str]]]]] = None
+        
+        # 三级表头列索引缓存：(列对象, {(日期, 班次): 列位置})，列对象变化时重建
+        self._shift_column_index: Optional[Tuple[pd.Index, Dict[Tuple[str, Any], int]]] = None
+        
     def process_lca_capacity_loss(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         处理LCA产能损失事件的主要入口函数
@@ -247,47 +284,43 @@ class LCACapacityLossProcessor:
             forecast值，如果未找到返回0.0
         """
         try:
-            # 直接读取Excel文件以获取三级表头信息
-            file_path = "data/daily plan.xlsx"
-            df_with_shifts = pd.read_excel(file_path, sheet_name=0, header=[0,1,2])
+            # 使用带三级表头信息的Daily Plan（同一文件只解析一次）
+            df_with_shifts = self._get_daily_plan_with_shifts()
+            if df_with_shifts is None:
+                return 0.0
             
             # 找到目标日期和班次对应的列
-            target_column = None
-            target_col_idx = None
-            for i, col in enumerate(df_with_shifts.columns):
-                if isinstance(col, tuple) and len(col) >= 3:
-                    date_obj = col[0]
-                    col_shift = col[2]
-                    
-                    # 处理日期格式转换
-                    formatted_date = None
-                    if hasattr(date_obj, 'strftime'):
-                        formatted_date = date_obj.strftime('%Y-%m-%d')
-                    elif isinstance(date_obj, str) and '-' in date_obj:
-                        try:
-                            day, month = date_obj.split('-')
-                            month_map = {
-                                'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04',
-                                'May': '05', 'Jun': '06', 'Jul': '07', 'Aug': '08', 
-                                'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'
-                            }
-                            if month in month_map:
-                                formatted_date = f"2025-{month_map[month]}-{day.zfill(2)}"
-                        except:
-                            continue
-                    
-                    # 找到匹配的日期和班次列
-                    if formatted_date == date and col_shift == shift:
-                        target_column = col
-                        target_col_idx = i
-                        break
+            target_col_idx = self._find_shift_column(df_with_shifts.columns, date, shift)
             
-            if target_column is None:
+            if target_col_idx is None:
                 self.logger.warning(f"未找到 {date} {shift} 对应的数据列")
                 return 0.0
             
             # 找到Forecast行 - 修复逻辑：找到与目标产线相关的forecast
-            line_column = df_with_shifts.columns[0]
+            # 只用到Line列和目标班次列：一次性取出两列的值并计算行掩码，
+            # 不再逐行iterrows构造行Series
+            line_values = df_with_shifts.iloc[:, 0].to_numpy(dtype=object)
+            target_values = df_with_shifts.iloc[:, target_col_idx].to_numpy(dtype=object)
+            line_present = pd.notna(line_values)
+            value_present = pd.notna(target_values)
+            # Forecast行中在目标班次有非零值的行位置
+            forecast_positions = np.flatnonzero(
+                line_present
+                & np.fromiter(("forecast" in str(v).lower() for v in line_values),
+                              dtype=bool, count=len(line_values))
+                & value_present
+                & (target_values != 0)
+            )
+            # 目标产线所在行位置（取第一处匹配）
+            target_line_row = None
+            if target_line:
+                line_positions = np.flatnonzero(
+                    line_present
+                    & np.fromiter((target_line in str(v) for v in line_values),
+                                  dtype=bool, count=len(line_values))
+                )
+                if len(line_positions):
+                    target_line_row = int(line_positions[0])
             
             # 区分两种用途：
             # 1. 如果target_line为None或用于本班预测产量计算，使用Forecast行
@@ -300,59 +333,25 @@ class LCACapacityLossProcessor:
             
             if target_line and (caller_name == "_get_next_two_shifts_forecast" or caller_name == "_calculate_new_dos"):
                 # 这是DOS计算中的I值获取或H值获取，使用产线行数据
-                for idx, row in df_with_shifts.iterrows():
-                    line_value = row[line_column]
-                    if pd.notna(line_value) and target_line in str(line_value):
-                        # 直接从该产线行获取目标列的值
-                        line_value = row[target_column]
-                        if pd.notna(line_value) and line_value != 0:
-                            return float(line_value)
-                        else:
-                            # 如果产线行在该班次没有值，返回0
-                            return 0.0
+                if target_line_row is not None:
+                    # 直接从该产线行获取目标列的值
+                    line_value = target_values[target_line_row]
+                    if value_present[target_line_row] and line_value != 0:
+                        return float(line_value)
+                    else:
+                        # 如果产线行在该班次没有值，返回0
+                        return 0.0
             else:
                 # 这是本班预测产量计算的E值获取，使用Forecast行
-                if target_line:
-                    # 找到目标产线行来确定对应的forecast
-                    target_line_row = None
-                    for idx, row in df_with_shifts.iterrows():
-                        line_value = row[line_column]
-                        if pd.notna(line_value) and target_line in str(line_value):
-                            target_line_row = idx
-                            # 移除重复的日志输出
-                            break
-                    
-                    # 查找最近的forecast行（在目标产线之前）
-                    if target_line_row is not None:
-                        forecast_rows = []
-                        for idx, row in df_with_shifts.iterrows():
-                            line_value = row[line_column]
-                            if pd.notna(line_value) and "forecast" in str(line_value).lower():
-                                forecast_value = row[target_column]
-                                if pd.notna(forecast_value) and forecast_value != 0:
-                                    forecast_rows.append((idx, forecast_value))
-                        
-                        # 找到最近的forecast行（在目标产线之前）
-                        closest_forecast_value = None
-                        min_distance = float('inf')
-                        
-                        for forecast_idx, forecast_value in forecast_rows:
-                            if forecast_idx < target_line_row:
-                                distance = target_line_row - forecast_idx
-                                if distance < min_distance:
-                                    min_distance = distance
-                                    closest_forecast_value = forecast_value
-                        
-                        if closest_forecast_value is not None:
-                            return float(closest_forecast_value)
+                # 查找最近的forecast行（在目标产线之前）
+                if target_line_row is not None:
+                    preceding = forecast_positions[forecast_positions < target_line_row]
+                    if len(preceding):
+                        return float(target_values[preceding[-1]])
             
             # 如果没有指定产线或没有找到相关forecast，使用原始逻辑（找第一个非零forecast）
-            for idx, row in df_with_shifts.iterrows():
-                line_value = row[line_column]
-                if pd.notna(line_value) and "forecast" in str(line_value).lower():
-                    forecast_value = row[target_column]
-                    if pd.notna(forecast_value) and forecast_value != 0:
-                        return float(forecast_value)
+            if len(forecast_positions):
+                return float(target_values[forecast_positions[0]])
             
             return 0.0
             
@@ -399,12 +398,13 @@ class LCACapacityLossProcessor:
             # 获取前3个班次的信息
             previous_shifts = self._get_previous_3_shifts(current_date, current_shift)
             
-            # 检查每个班次是否有损失报告
+            # 检查每个班次是否有损失报告（该产线的损失事件只查询一次）
+            line_events = self._index_lca_events_by_shift(current_line)
             shifts_with_loss = []
             total_loss = 0
             
             for shift_info in previous_shifts:
-                loss_data = self._get_shift_loss_data(shift_info, current_line, daily_plan_data)
+                loss_data = self._get_shift_loss_data(shift_info, current_line, daily_plan_data, line_events)
                 
                 if loss_data["has_loss"]:
                     shifts_with_loss.append(loss_data)
@@ -441,14 +441,19 @@ class LCACapacityLossProcessor:
         """
         获取包含班次信息的Daily Plan数据
         
+        解析结果由数据加载器按源文件指纹缓存在内存中，各班次、产线和forecast查询共用同一份数据，只读使用；
+        进程重启后由数据加载器的磁盘缓存提供，无需重新解析Excel
+        
         Returns:
             带有班次信息的DataFrame或None
         """
         try:
-            # 直接读取Excel文件的三级表头以保留班次信息
-            file_path = "data/daily plan.xlsx"
-            df_with_shifts = pd.read_excel(file_path, sheet_name=0, header=[0,1,2])
-            self.logger.info(f"成功加载带班次信息的Daily Plan: {df_with_shifts.shape}")
+            # 直接读取Excel文件的三级表头以保留班次信息；源文件未变化时返回同一个DataFrame对象
+            file_path = self.data_loader.file_paths["HSA Daily Plan"]
+            df_with_shifts = self.data_loader.read_excel_cached(file_path, sheet_name=0, header=[0,1,2])
+            if df_with_shifts is not self._daily_plan_cache:
+                self.logger.info(f"成功加载带班次信息的Daily Plan: {df_with_shifts.shape}")
+                self._daily_plan_cache = df_with_shifts
             return df_with_shifts
             
         except Exception as e:
@@ -463,6 +468,24 @@ class LCACapacityLossProcessor:
             except:
                 return None
     
+    def _get_daily_plan_header(self) -> Optional[pd.DataFrame]:
+        """
+        只读取Daily Plan的三级表头（nrows=0，不解析数据行）
+        
+        用于只需要日期-班次组合的场合，列与_get_daily_plan_with_shifts的结果相同
+        
+        Returns:
+            只有表头没有数据行的DataFrame或None
+        """
+        try:
+            file_path = self.data_loader.file_paths["HSA Daily Plan"]
+            # 经由数据加载器读取：源文件未变化时直接使用内存或磁盘缓存，不再重复解析工作簿
+            return self.data_loader.read_excel_cached(file_path, sheet_name=0, header=[0,1,2], nrows=0)
+        except Exception as e:
+            self.logger.error(f"获取Daily Plan表头失败: {str(e)}")
+            # 读取失败时与_get_daily_plan_with_shifts相同，回退到扁平化的Daily Plan
+            return self._get_daily_plan_with_shifts()
+    
     def _get_previous_3_shifts(self, current_date: str, current_shift: str) -> List[Dict[str, str]]:
         """
         获取前3个班次的信息 - 只从Daily Plan中实际存在的班次中查找
@@ -475,8 +498,8 @@ class LCACapacityLossProcessor:
             前3个班次的列表，每个元素包含日期和班次信息
         """
         try:
-            # 获取Daily Plan数据以获取实际的日期和班次组合
-            daily_plan = self._get_daily_plan_with_shifts()
+            # 只需要表头中实际的日期和班次组合，不解析数据行
+            daily_plan = self._get_daily_plan_header()
             if daily_plan is None:
                 self.logger.error("无法获取Daily Plan数据")
                 return []
@@ -604,7 +627,25 @@ class LCACapacityLossProcessor:
         
         return -1
     
-    def _get_shift_loss_data(self, shift_info: Dict[str, str], line: str, daily_plan: pd.DataFrame) -> Dict[str, Any]:
+    def _index_lca_events_by_shift(self, line: str) -> Dict[Tuple[Any, Any], Dict[str, Any]]:
+        """
+        一次查询指定产线的全部LCA损失事件，并按 (影响日期, 影响班次) 建立索引
+        
+        Args:
+            line: 产线名称
+            
+        Returns:
+            {(影响日期, 影响班次): 事件}，同一班次有多个事件时保留最新创建的一个
+        """
+        events_by_shift: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+        # 查询结果按创建时间倒序，setdefault保留每个班次的第一个（最新）事件
+        for event in self.db_manager.get_lca_events_by_criteria(line=line):
+            affect_date = event.get("_lca_details", {}).get("affect_date")
+            events_by_shift.setdefault((affect_date, event.get("选择影响班次")), event)
+        return events_by_shift
+    
+    def _get_shift_loss_data(self, shift_info: Dict[str, str], line: str, daily_plan: pd.DataFrame,
+                             line_events: Optional[Dict[Tuple[Any, Any], Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         从事件表获取指定班次的损失数据
         
@@ -612,6 +653,7 @@ class LCACapacityLossProcessor:
             shift_info: 班次信息字典
             line: 产线名称
             daily_plan: Daily Plan数据
+            line_events: 可选，_index_lca_events_by_shift的结果，未提供时查询数据库
             
         Returns:
             班次损失数据
@@ -621,24 +663,11 @@ class LCACapacityLossProcessor:
             shift = shift_info["shift"]
             
             # 从数据库查询历史LCA损失事件
-            from .database_manager import DatabaseManager
-            
-            # 创建数据库管理器实例
-            db_manager = DatabaseManager("data/events.db")
-            
-            # 查询匹配的LCA事件
-            matching_events = db_manager.get_lca_events_by_criteria(
-                date=date,
-                line=line
-            )
+            if line_events is None:
+                line_events = self._index_lca_events_by_shift(line)
             
-            # 查找匹配班次的事件
-            matched_event = None
-            for event in matching_events:
-                event_shift = event.get("选择影响班次")
-                if event_shift == shift:
-                    matched_event = event
-                    break
+            # 查找匹配日期和班次的事件
+            matched_event = line_events.get((date, shift))
             
             if matched_event:
                 # 提取损失数据
@@ -658,9 +687,10 @@ class LCACapacityLossProcessor:
                     "line": line,
                     "has_loss": loss_amount > 0,
                     "loss_amount": loss_amount,
+                    # 只保留事件ID引用，完整事件数据可按ID从数据库查询，
+                    # 不随每个班次的检查结果重复保存
                     "event_id": matched_event.get("事件ID", ""),
-                    "source": "事件数据库",
-                    "event_data": matched_event
+                    "source": "事件数据库"
                 }
             else:
                 # 没有找到匹配的事件
@@ -711,6 +741,8 @@ class LCACapacityLossProcessor:
         """
         加载FG EOH数据
         
+        解析结果按文件修改时间缓存，文件未修改时直接返回，只读使用
+        
         Returns:
             FG EOH DataFrame或None
         """
@@ -720,7 +752,13 @@ class LCACapacityLossProcessor:
                 self.logger.error(f"FG EOH文件不存在: {file_path}")
                 return None
             
-            df = pd.read_excel(file_path, sheet_name=0)
+            mtime = os.stat(file_path).st_mtime
+            if self._fg_eoh_cache is not None and self._fg_eoh_cache[0] == mtime:
+                return self._fg_eoh_cache[1]
+            
+            # 只读取计算G值需要的列，跳过各仓库明细列的解析和类型推断
+            df = pd.read_excel(file_path, sheet_name=0, engine=EXCEL_ENGINE,
+                               usecols=lambda col: str(col).strip() in _FG_EOH_COLUMNS)
             
             # 清理列名中的多余空格
             df.columns = df.columns.str.strip()
@@ -731,6 +769,7 @@ class LCACapacityLossProcessor:
             
             self.logger.info(f"成功加载FG EOH数据: {df.shape}")
             self.logger.info(f"列名: {list(df.columns)}")
+            self._fg_eoh_cache = (mtime, df)
             return df
             
         except Exception as e:
@@ -773,7 +812,11 @@ class LCACapacityLossProcessor:
             head_qty = pn_row['Head_Qty']
             
             # 找到同一Product和Head_Qty组的所有行
-            group_rows = df[(df['Product'] == product) & (df['Head_Qty'] == head_qty)]
+            # 分组行位置随数据只计算一次，之后按键直接取行，不再每次对整表做两次比较
+            if self._fg_eoh_groups is None or self._fg_eoh_groups[0] is not df:
+                self._fg_eoh_groups = (df, df.groupby(['Product', 'Head_Qty'], sort=False).indices)
+            positions = self._fg_eoh_groups[1].get((product, head_qty), np.array([], dtype=np.intp))
+            group_rows = df.iloc[positions]
             
             # 计算TTL QTY总和作为G值
             g_value = group_rows['TTL QTY'].sum()
@@ -811,8 +854,8 @@ class LCACapacityLossProcessor:
             (I值, 详细信息字典)
         """
         try:
-            # 获取所有可用班次
-            daily_plan = self._get_daily_plan_with_shifts()
+            # 获取所有可用班次（只需要表头）
+            daily_plan = self._get_daily_plan_header()
             if daily_plan is None:
                 return 0.0, {"status": "error", "message": "无法获取Daily Plan数据"}
             
@@ -1381,8 +1424,8 @@ class LCACapacityLossProcessor:
             后续班次列表，每个元素包含日期和班次信息
         """
         try:
-            # 获取Daily Plan数据以获取实际的日期和班次组合
-            daily_plan = self._get_daily_plan_with_shifts()
+            # 只需要表头中实际的日期和班次组合，不解析数据行
+            daily_plan = self._get_daily_plan_header()
             if daily_plan is None:
                 return []
             
@@ -1606,6 +1649,70 @@ class LCACapacityLossProcessor:
                 "has_events": False
             }
     
+    def _get_event_rows(self, daily_plan: pd.DataFrame, target_line: str) -> List[Tuple[int, str, str]]:
+        """
+        识别目标产线范围内的事件行，结果按 (Daily Plan, 产线) 缓存
+        
+        Args:
+            daily_plan: Daily Plan DataFrame
+            target_line: 目标产线，为空时检查整张表
+            
+        Returns:
+            [(行位置, 事件类型, Line列文本), ...]，每行取第一个匹配的事件类型
+        """
+        if self._event_rows_cache is None or self._event_rows_cache[0] is not daily_plan:
+            self._event_rows_cache = (daily_plan, {})
+        rows_by_line = self._event_rows_cache[1]
+        if target_line in rows_by_line:
+            return rows_by_line[target_line]
+        
+        # 检查Line列中的事件类型，但只检查指定产线范围内的事件
+        line_values = daily_plan.iloc[:, 0].to_numpy(dtype=object)
+        
+        # 如果指定了目标产线，找到该产线在表格中的行范围
+        target_line_start = None
+        target_line_end = None
+        
+        if target_line:
+            for idx, line_value in enumerate(line_values):
+                if pd.notna(line_value):
+                    line_str = str(line_value).strip()
+                    
+                    # 找到目标产线的开始行
+                    if target_line in line_str and target_line_start is None:
+                        target_line_start = idx
+                    
+                    # 找到下一个产线的开始行作为结束边界
+                    elif target_line_start is not None and _F_LINE_PATTERN.search(line_str):
+                        # 如果发现其他F系列产线，说明当前产线范围结束
+                        if target_line not in line_str:
+                            target_line_end = idx
+                            break
+            
+            # 如果没找到结束边界，搜索到表格末尾
+            if target_line_start is not None and target_line_end is None:
+                target_line_end = len(daily_plan)
+        
+        # 只在指定产线范围内搜索事件
+        search_start = target_line_start if target_line_start is not None else 0
+        search_end = target_line_end if target_line_end is not None else len(daily_plan)
+        
+        event_rows = []
+        for idx in range(search_start, min(search_end, len(line_values))):
+            line_value = line_values[idx]
+            
+            if pd.notna(line_value):
+                line_str = str(line_value).strip()
+                
+                # 检查是否包含目标事件类型
+                for event_type in _SHIFT_EVENT_TYPES:
+                    if event_type in line_str:
+                        event_rows.append((idx, event_type, line_str))
+                        break  # 避免同一行重复计数
+        
+        rows_by_line[target_line] = event_rows
+        return event_rows
+    
     def _count_events_in_shift(self, daily_plan: pd.DataFrame, 
                              date: str, shift: str, target_line: str = "") -> Dict[str, Any]:
         """
@@ -1624,87 +1731,30 @@ class LCACapacityLossProcessor:
         event_types = []
         
         try:
-            # 目标事件类型
-            target_event_types = [
-                "LCA", "Manual", "Recycle HGA", "PM"
-            ]
-            
             # 找到目标日期和班次对应的列
-            target_column = None
-            for col in daily_plan.columns:
-                if isinstance(col, tuple) and len(col) >= 3:
-                    date_obj = col[0]
-                    col_shift = col[2]
-                    
-                    # 处理日期格式转换
-                    formatted_date = self._format_date_from_column(date_obj)
-                    
-                    if formatted_date == date and col_shift == shift:
-                        target_column = col
-                        break
+            target_column = self._find_shift_column(daily_plan.columns, date, shift)
             
             if target_column is None:
                 return {"count": 0, "types": [], "details": []}
             
-            # 检查Line列中的事件类型，但只检查指定产线范围内的事件
-            line_column = daily_plan.columns[0]
+            # 产线范围内的事件行与班次无关，同一产线只识别一次；
+            # 每个班次只需读取这些行在目标班次列的值
+            target_values = daily_plan.iloc[:, target_column].to_numpy(dtype=object)
             event_details = []
             
-            # 如果指定了目标产线，找到该产线在表格中的行范围
-            target_line_start = None
-            target_line_end = None
-            
-            if target_line:
-                for idx, row in daily_plan.iterrows():
-                    line_value = row[line_column]
-                    if pd.notna(line_value):
-                        line_str = str(line_value).strip()
-                        
-                        # 找到目标产线的开始行
-                        if target_line in line_str and target_line_start is None:
-                            target_line_start = idx
-                        
-                        # 找到下一个产线的开始行作为结束边界
-                        elif target_line_start is not None and any(f"F{i}" in line_str for i in range(10, 50)):
-                            # 如果发现其他F系列产线，说明当前产线范围结束
-                            if target_line not in line_str:
-                                target_line_end = idx
-                                break
-                
-                # 如果没找到结束边界，搜索到表格末尾
-                if target_line_start is not None and target_line_end is None:
-                    target_line_end = len(daily_plan)
-            
-            # 只在指定产线范围内搜索事件
-            search_start = target_line_start if target_line_start is not None else 0
-            search_end = target_line_end if target_line_end is not None else len(daily_plan)
-            
-            for idx in range(search_start, search_end):
-                if idx >= len(daily_plan):
-                    break
-                    
-                row = daily_plan.iloc[idx]
-                line_value = row[line_column]
+            for idx, event_type, line_str in self._get_event_rows(daily_plan, target_line):
+                # 检查该事件在目标班次是否有数值
+                event_value = target_values[idx]
                 
-                if pd.notna(line_value):
-                    line_str = str(line_value).strip()
-                    
-                    # 检查是否包含目标事件类型
-                    for event_type in target_event_types:
-                        if event_type in line_str:
-                            # 检查该事件在目标班次是否有数值
-                            event_value = row[target_column]
-                            
-                            if pd.notna(event_value) and event_value != 0:
-                                event_count += 1
-                                if event_type not in event_types:
-                                    event_types.append(event_type)
-                                event_details.append({
-                                    "type": event_type,
-                                    "line_description": line_str,
-                                    "value": event_value
-                                })
-                                break  # 避免同一行重复计数
+                if pd.notna(event_value) and event_value != 0:
+                    event_count += 1
+                    if event_type not in event_types:
+                        event_types.append(event_type)
+                    event_details.append({
+                        "type": event_type,
+                        "line_description": line_str,
+                        "value": event_value
+                    })
             
             return {
                 "count": event_count,
@@ -1783,27 +1833,52 @@ class LCACapacityLossProcessor:
         try:
             # 尝试从capacity数据获取
             capacity_data = self.data_loader.get_data("capacity")
+        except Exception:
+            return 7000.0
+        
+        # 同一份产能数据下，同一产线的查询结果不变，只查找一次
+        if self._line_capacity_cache is None or self._line_capacity_cache[0] is not capacity_data:
+            self._line_capacity_cache = (capacity_data, {})
+        capacities = self._line_capacity_cache[1]
+        if target_line not in capacities:
+            capacities[target_line] = self._find_line_capacity(capacity_data, target_line)
+        return capacities[target_line]
+    
+    def _find_line_capacity(self, capacity_data: Optional[pd.DataFrame], target_line: str) -> float:
+        """
+        在产能数据中查找产线总产能，未找到时按产线使用默认值
+        
+        Args:
+            capacity_data: 产能数据，可能为None
+            target_line: 目标产线
+            
+        Returns:
+            产线总产能，默认7000
+        """
+        try:
             if capacity_data is not None:
+                # 只用到第一列和产能相关的列：取出第一列的值、确定产能列位置，
+                # 匹配行按位置读取单元格，不再逐行iterrows构造行Series
+                line_names = capacity_data.iloc[:, 0].to_numpy(dtype=object)  # 假设第一列是产线名称
+                capacity_positions = [
+                    pos for pos, col in enumerate(capacity_data.columns)
+                    if "capacity" in str(col).lower() or "产能" in str(col)
+                ]
                 # 查找目标产线的产能信息
-                for idx, row in capacity_data.iterrows():
-                    if target_line in str(row.iloc[0]):  # 假设第一列是产线名称
-                        # 查找产能相关的列
-                        for col in capacity_data.columns:
-                            if "capacity" in str(col).lower() or "产能" in str(col):
-                                capacity_value = row[col]
-                                if pd.notna(capacity_value) and capacity_value > 0:
-                                    return float(capacity_value)
+                for idx, line_name in enumerate(line_names):
+                    if target_line in str(line_name):
+                        for pos in capacity_positions:
+                            capacity_value = capacity_data.iloc[idx, pos]
+                            if pd.notna(capacity_value) and capacity_value > 0:
+                                return float(capacity_value)
             
             # 如果没有找到capacity数据，使用默认值
-            # 可以根据产线类型设置不同的默认值
-            default_capacities = {
-                "F16": 6000,
-                "F25": 7000, 
-                "F29": 8000,
-                "F32": 7500
-            }
+            # 产线名称正好是产线代码时直接查表，否则按包含关系匹配（如 "F16-1"）
+            capacity = _DEFAULT_LINE_CAPACITIES.get(target_line)
+            if capacity is not None:
+                return capacity
             
-            for line_code, capacity in default_capacities.items():
+            for line_code, capacity in _DEFAULT_LINE_CAPACITIES.items():
                 if line_code in target_line:
                     return capacity
             
@@ -1839,6 +1914,31 @@ class LCACapacityLossProcessor:
         except Exception:
             return ""
     
+    def _find_shift_column(self, columns: pd.Index, date: str, shift: str) -> Optional[int]:
+        """
+        查找指定日期和班次在三级表头中对应的列位置
+        
+        每组列只建立一次 (日期, 班次) -> 列位置 的索引，每个不同的日期表头只格式化一次，
+        之后的查询直接查字典，不再逐列转换日期
+        
+        Args:
+            columns: 三级表头DataFrame的列
+            date: 日期字符串 (YYYY-MM-DD格式)
+            shift: 班次 (T1, T2, T3, T4)
+            
+        Returns:
+            第一个匹配列的位置，未找到返回None
+        """
+        if self._shift_column_index is None or self._shift_column_index[0] is not columns:
+            index: Dict[Tuple[str, Any], int] = {}
+            if isinstance(columns, pd.MultiIndex) and columns.nlevels >= 3:
+                codes, uniques = pd.factorize(columns.get_level_values(0), use_na_sentinel=False)
+                formatted = [self._format_date_from_column(date_obj) for date_obj in uniques]
+                for pos, (code, col_shift) in enumerate(zip(codes, columns.get_level_values(2))):
+                    index.setdefault((formatted[code], col_shift), pos)
+            self._shift_column_index = (columns, index)
+        return self._shift_column_index[1].get((date, shift))
+    
     def _get_line_planned_production(self, date: str, shift: str, target_line: str) -> float:
         """
         获取指定产线在指定班次的安排产量（直接从产线行获取）
@@ -1858,30 +1958,17 @@ class LCACapacityLossProcessor:
                 return 0.0
             
             # 找到目标日期和班次对应的列
-            target_column = None
-            line_column = df_with_shifts.columns[0]
-            
-            for col in df_with_shifts.columns[1:]:
-                if isinstance(col, tuple) and len(col) >= 3:
-                    date_obj = col[0]
-                    col_shift = col[2]
-                    
-                    # 处理日期格式转换
-                    formatted_date = self._format_date_from_column(date_obj)
-                    
-                    if formatted_date == date and col_shift == shift:
-                        target_column = col
-                        break
-            
-            if target_column is None:
+            target_col_idx = self._find_shift_column(df_with_shifts.columns, date, shift)
+            if target_col_idx is None:
                 return 0.0
             
             # 找到目标产线行，直接获取安排产量
-            for idx, row in df_with_shifts.iterrows():
-                line_value = row[line_column]
+            # 只需Line列和目标班次列，按位置读取单元格，不再逐行iterrows
+            line_values = df_with_shifts.iloc[:, 0].to_numpy(dtype=object)
+            for idx, line_value in enumerate(line_values):
                 if pd.notna(line_value) and target_line in str(line_value):
                     # 从产线行获取该班次的安排产量
-                    production_value = row[target_column]
+                    production_value = df_with_shifts.iloc[idx, target_col_idx]
                     if pd.notna(production_value):
                         return float(production_value)
                     else:
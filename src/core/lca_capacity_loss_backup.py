@@ -10,6 +10,8 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any, Tuple, Optional
 import logging
 
+from .data_loader import EXCEL_ENGINE
+
 
 class LCACapacityLossProcessor:
     """
@@ -190,7 +192,7 @@ class LCACapacityLossProcessor:
         try:
             # 直接读取Excel文件的三级表头以保留班次信息
             file_path = "data/daily plan.xlsx"
-            df_with_shifts = pd.read_excel(file_path, sheet_name=0, header=[0,1,2])
+            df_with_shifts = pd.read_excel(file_path, sheet_name=0, header=[0,1,2], engine=EXCEL_ENGINE)
             self.logger.info(f"成功加载带班次信息的Daily Plan: {df_with_shifts.shape}")
             return df_with_shifts
             
@@ -29,6 +29,9 @@ class EventFormUI:
         self.current_event_data = {}
         self.current_branch = None
         
+        # LCA处理器，首次执行LCA逻辑时创建，之后复用其解析缓存
+        self._lca_processor = None
+        
         # UI组件存储
         self.level_frames = []
         self.level_widgets = []
@@ -91,6 +94,12 @@ class EventFormUI:
             self.event_tree.heading(col, text=col)
             self.event_tree.column(col, width=120)
         
+        # 批量插入行的Tcl过程：刷新列表时一次Python到Tcl的调用插入全部事件，而不是每行一次
+        self.event_tree.tk.eval(
+            'proc ::treeview_append_rows {tree rows} {'
+            ' foreach row $rows { $tree insert {} end -values $row } }'
+        )
+        
         # 滚动条
         list_scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.event_tree.yview)
         self.event_tree.configure(yscrollcommand=list_scrollbar.set)
@@ -156,6 +165,8 @@ class EventFormUI:
         # 存储所有输入组件
         self.form_widgets = {}
         self.form_variables = {}
+        # 尚未加载选项的下拉框 {字段名: 数据源}，首次展开时才查询
+        self._pending_options = {}
         
         # 添加事件描述
         desc_frame = ttk.Frame(self.form_frame)
@@ -208,16 +219,14 @@ class EventFormUI:
                 var = tk.StringVar()
                 self.form_variables[field_name] = var
                 
-                # 获取选项
-                options = self.event_manager.get_data_source_options(
-                    level_config["source"], 
-                    {}  # 初始为空，后续根据其他字段更新
-                )
+                # 选项延迟到首次展开下拉框时再获取，后续根据其他字段更新
+                self._pending_options[field_name] = level_config["source"]
                 
                 combo = ttk.Combobox(
                     parent_frame,
                     textvariable=var,
-                    values=options,
+                    values=[],
+                    postcommand=lambda name=field_name: self.load_pending_options(name),
                     state="readonly",
                     width=30,
                     font=("Arial", 10)
@@ -255,11 +264,7 @@ class EventFormUI:
     def build_branch_section(self, parent_frame: ttk.Frame, event_config: Dict):
         """构建分支选择区域"""
         # 找到有分支的字段
-        branch_field = None
-        for level_config in event_config["levels"]:
-            if level_config.get("branches"):
-                branch_field = level_config
-                break
+        branch_field = self.event_manager.get_branch_field(self.current_event_type)
         
         if not branch_field:
             return
@@ -314,11 +319,7 @@ class EventFormUI:
             widget.destroy()
         
         # 获取选择的分支
-        branch_field = None
-        for level_config in self.event_manager.event_types[self.current_event_type]["levels"]:
-            if level_config.get("branches"):
-                branch_field = level_config
-                break
+        branch_field = self.event_manager.get_branch_field(self.current_event_type)
         
         if not branch_field:
             return
@@ -383,6 +384,17 @@ class EventFormUI:
                                              font=("Arial", 9), foreground="gray")
                         hint_label.pack(side=tk.LEFT, padx=(10, 0))
     
+    def load_pending_options(self, field_name: str):
+        """下拉框首次展开时加载初始选项（无上下文的完整列表）"""
+        source = self._pending_options.pop(field_name, None)
+        if source is not None and field_name in self.form_widgets:
+            self.form_widgets[field_name]["values"] = self.event_manager.get_data_source_options(source, {})
+    
+    def set_field_options(self, field_name: str, options: List[str]):
+        """设置下拉框选项，已按上下文设置的选项不再被初始选项覆盖"""
+        self._pending_options.pop(field_name, None)
+        self.form_widgets[field_name]["values"] = options
+    
     def on_field_changed(self, event=None):
         """当字段值改变时，更新相关联的字段选项"""
         # 获取触发事件的组件
@@ -408,7 +420,7 @@ class EventFormUI:
             date_value = context.get("选择影响日期")
             if date_value:
                 shifts = self.event_manager.get_data_source_options("shifts", context)
-                self.form_widgets["选择影响班次"]["values"] = shifts
+                self.set_field_options("选择影响班次", shifts)
                 
                 # 检查当前班次是否还有效，如果无效则清空
                 current_shift = self.form_variables["选择影响班次"].get()
@@ -417,10 +429,10 @@ class EventFormUI:
                     # 清空依赖班次的字段
                     if "选择产线" in self.form_variables:
                         self.form_variables["选择产线"].set("")
-                        self.form_widgets["选择产线"]["values"] = []
+                        self.set_field_options("选择产线", [])
                     if "确认产品PN" in self.form_variables:
                         self.form_variables["确认产品PN"].set("")
-                        self.form_widgets["确认产品PN"]["values"] = []
+                        self.set_field_options("确认产品PN", [])
                 
                 self.log_message("INFO", f"日期 {date_value} 的班次选项已更新: {shifts}")
         
@@ -430,7 +442,7 @@ class EventFormUI:
             "选择产线" in self.form_widgets):
             
             lines = self.event_manager.get_data_source_options("production_lines", context)
-            self.form_widgets["选择产线"]["values"] = lines
+            self.set_field_options("选择产线", lines)
             
             # 检查当前产线是否还有效，如果无效则清空
             current_line = self.form_variables["选择产线"].get()
@@ -439,7 +451,7 @@ class EventFormUI:
                 # 清空依赖产线的字段
                 if "确认产品PN" in self.form_variables:
                     self.form_variables["确认产品PN"].set("")
-                    self.form_widgets["确认产品PN"]["values"] = []
+                    self.set_field_options("确认产品PN", [])
             
             self.log_message("INFO", f"产线选项已更新，共 {len(lines)} 个")
         
@@ -449,7 +461,7 @@ class EventFormUI:
             "确认产品PN" in self.form_widgets):
             
             pns = self.event_manager.get_data_source_options("product_pn", context)
-            self.form_widgets["确认产品PN"]["values"] = pns
+            self.set_field_options("确认产品PN", pns)
             
             # 检查当前PN是否还有效，如果无效则清空
             current_pn = self.form_variables["确认产品PN"].get()
@@ -793,19 +805,17 @@ class EventFormUI:
     
     def refresh_event_list(self):
         """刷新事件列表"""
-        # 清除现有项目
-        for item in self.event_tree.get_children():
-            self.event_tree.delete(item)
+        # 清除现有项目（一次调用删除全部）
+        self.event_tree.delete(*self.event_tree.get_children())
         
         # 添加事件
         events = self.event_manager.get_events()
-        for event in events:
-            self.event_tree.insert("", "end", values=(
-                event.get("事件ID", ""),
-                event.get("事件类型", ""),
-                event.get("创建时间", ""),
-                "已创建"
-            ))
+        rows = tuple(
+            (event.get("事件ID", ""), event.get("事件类型", ""), event.get("创建时间", ""), "已创建")
+            for event in events
+        )
+        if rows:
+            self.event_tree.tk.call('::treeview_append_rows', str(self.event_tree), rows)
     
     def execute_selected_event(self):
         """执行选中的事件"""
@@ -885,28 +895,30 @@ class EventFormUI:
             # 创建LCA处理器并执行处理
             from src.core.lca_capacity_loss import LCACapacityLossProcessor
             
-            # 创建LCA处理器，使用GUI的日志回调
-            class GUILoggerAdapter:
-                def __init__(self, log_callback):
-                    self.log_callback = log_callback
-                
-                def info(self, message):
-                    self.log_callback("INFO", message)
-                
-                def error(self, message):
-                    self.log_callback("ERROR", message)
+            # 创建LCA处理器，使用GUI的日志回调（只创建一次，之后复用其解析缓存）
+            if self._lca_processor is None:
+                class GUILoggerAdapter:
+                    def __init__(self, log_callback):
+                        self.log_callback = log_callback
+                    
+                    def info(self, message):
+                        self.log_callback("INFO", message)
+                    
+                    def error(self, message):
+                        self.log_callback("ERROR", message)
+                    
+                    def warning(self, message):
+                        self.log_callback("WARNING", message)
+                    
+                    def debug(self, message):
+                        self.log_callback("DEBUG", message)
                 
-                def warning(self, message):
-                    self.log_callback("WARNING", message)
+                # 获取data_loader实例
+                data_loader = self.event_manager.data_loader
+                logger = GUILoggerAdapter(self.log_message)
                 
-                def debug(self, message):
-                    self.log_callback("DEBUG", message)
-            
-            # 获取data_loader实例
-            data_loader = self.event_manager.data_loader
-            logger = GUILoggerAdapter(self.log_message)
-            
-            lca_processor = LCACapacityLossProcessor(data_loader, logger)
+                self._lca_processor = LCACapacityLossProcessor(data_loader, logger)
+            lca_processor = self._lca_processor
             
             # 执行LCA处理逻辑
             result = lca_processor.process_lca_capacity_loss(event_data)
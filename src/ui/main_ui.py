@@ -9,6 +9,12 @@ from src.core.data_loader import DataLoader
 from src.core.event_manager import EventManager
 from src.ui.event_ui import EventFormUI
 
+# 系统日志控件最多保留的行数，超出时删除最早的日志
+_LOG_MAX_LINES = 2000
+
+# 数据预览逐列向量化格式化的最小行数，行数较少时逐列处理的固定开销超过收益
+_COLUMNWISE_FORMAT_MIN_ROWS = 1000
+
 class ProductionSchedulingSystem:
     """
     Main class for the Production Scheduling System application.
@@ -37,6 +43,25 @@ class ProductionSchedulingSystem:
         # Currently selected sheet
         self.current_sheet = tk.StringVar()
         
+        # 数据预览的虚拟化状态：格式化后的全部行、每行的样式标签、当前首个可见行
+        self._preview_values = np.empty((0, 0), dtype=object)
+        self._preview_tags = []
+        self._preview_first = 0
+        # 上次插入Treeview的 (行数组, 首行, 末行)，范围未变化时不重复删除和插入
+        self._preview_rendered = None
+        # Treeview当前显示的列
+        self._preview_columns = None
+        
+        # 待写入日志控件的 (文本, 标签, 文本, 标签, ...)，以及是否已安排写入
+        self._log_buffer = []
+        self._log_pending = False
+        # 日志时间戳缓存：(整秒时间, 格式化字符串)，同一秒内的日志复用
+        self._ts_cache = (0, "")
+        
+        # 格式化结果缓存：(数据类型, sheet) -> (数据, 表头, 格式化后的行, 样式标签)
+        # 数据或表头对象变化（重新加载）时自动失效
+        self._preview_cache = {}
+        
         # Build the UI first
         self.setup_ui()
         
@@ -266,13 +291,26 @@ class ProductionSchedulingSystem:
         self.data_tree.tag_configure('evenrow', background='white')
         self.data_tree.tag_configure('header', font=('Arial', 9, 'bold'))
         
+        # 批量插入行的Tcl过程：一次Python到Tcl的调用插入所有可见行，而不是每行一次
+        self.data_tree.tk.eval(
+            'proc ::treeview_insert_rows {tree rows tags} {'
+            ' foreach row $rows tag $tags { $tree insert {} end -values $row -tags [list $tag] } }'
+        )
+        
         # Scrollbars for the treeview
-        y_scrollbar = ttk.Scrollbar(data_frame, orient=tk.VERTICAL, command=self.data_tree.yview)
+        # Treeview中只保留可见范围内的行，垂直滚动条按全部数据的位置由预览自行驱动
+        self.data_y_scrollbar = ttk.Scrollbar(data_frame, orient=tk.VERTICAL, command=self._on_preview_yview)
         x_scrollbar = ttk.Scrollbar(data_frame, orient=tk.HORIZONTAL, command=self.data_tree.xview)
-        self.data_tree.configure(yscrollcommand=y_scrollbar.set, xscrollcommand=x_scrollbar.set)
+        self.data_tree.configure(xscrollcommand=x_scrollbar.set)
+        
+        # 鼠标滚轮和窗口尺寸变化时重新渲染可见行
+        self.data_tree.bind("<MouseWheel>", self._on_preview_mousewheel)
+        self.data_tree.bind("<Button-4>", self._on_preview_mousewheel)
+        self.data_tree.bind("<Button-5>", self._on_preview_mousewheel)
+        self.data_tree.bind("<Configure>", lambda event: self._render_preview())
         
         # Pack scrollbars and treeview
-        y_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.data_y_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         x_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
         self.data_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
@@ -353,25 +391,18 @@ class ProductionSchedulingSystem:
             "failed": 0
         }
         
-        # 依次加载每个表
         for data_type in data_tables:
-            self.auto_load_single_data(data_type)
-    
-    def auto_load_single_data(self, data_type):
-        """
-        自动加载单个数据表
-        
-        Args:
-            data_type: 要加载的数据类型
-        """
-        self.log_message("INFO", f"正在加载 {data_type}...")
+            self.log_message("INFO", f"正在加载 {data_type}...")
         
-        def load_thread():
-            success, message, data = self.data_loader.load_data(data_type)
-            
+        def on_loaded(data_type, result):
             # 在主线程中更新UI
+            success, message, _ = result
             self.root.after(0, lambda: self.on_auto_data_loaded(success, message, data_type))
-            
+        
+        def load_thread():
+            # 各表在后台线程池中并行加载，每完成一个立即通知UI
+            self.data_loader.load_all(data_tables, on_loaded=on_loaded)
+        
         threading.Thread(target=load_thread).start()
     
     def on_auto_data_loaded(self, success, message, data_type):
@@ -506,15 +537,21 @@ class ProductionSchedulingSystem:
         """
         self.refresh_data_preview()
     
-    def get_current_data(self):
+    def get_current_data(self, data_type=None, sheet=None):
         """
         根据当前选择的数据类型和工作表获取对应的数据
         
+        Args:
+            data_type: 数据类型，默认取当前选择（在后台线程中调用时需显式传入）
+            sheet: 工作表名称，默认取当前选择
+        
         Returns:
             当前选择的数据
         """
-        data_type = self.current_data_type.get()
-        sheet = self.current_sheet.get()
+        if data_type is None:
+            data_type = self.current_data_type.get()
+        if sheet is None:
+            sheet = self.current_sheet.get()
         
         # 如果没有选择数据类型或工作表，返回None
         if not data_type:
@@ -548,108 +585,290 @@ class ProductionSchedulingSystem:
         """
         Refresh the data preview based on the currently selected data type.
         """
-        data = self.get_current_data()
+        data_type = self.current_data_type.get()
+        sheet = self.current_sheet.get()
+        
+        # 辅助sheet和Daily Plan的其他sheet在首次访问时才解析Excel，
+        # 放到后台线程获取数据，避免解析期间界面卡住
+        def load_thread():
+            data = self.get_current_data(data_type, sheet)
+            # 表格文本的格式化同样在后台完成，主线程只负责插入可见行
+            prepared = None
+            if data is not None and not data.empty:
+                prepared = self._prepare_preview(data_type, sheet, data)
+            
+            # Update UI in the main thread
+            self.root.after(0, lambda: self.on_preview_data_ready(data_type, sheet, data, prepared))
+            
+        threading.Thread(target=load_thread, daemon=True).start()
+    
+    def on_preview_data_ready(self, data_type, sheet, data, prepared=None):
+        """
+        后台获取预览数据完成的回调（在主线程中执行）
+        
+        Args:
+            data_type: 获取时的数据类型
+            sheet: 获取时的工作表名称
+            data: 获取到的数据
+            prepared: 后台已格式化的 (格式化后的行, 样式标签)
+        """
+        # 获取期间用户已切换到其他数据，丢弃过期结果
+        if data_type != self.current_data_type.get() or sheet != self.current_sheet.get():
+            return
         
         if data is None:
             self.log_message("INFO", "未选择数据或数据未加载，请先加载数据")
             return
             
         self.current_data = data
-        self.display_data_in_tree(data)
+        self.display_data_in_tree(data, prepared)
         
-    def display_data_in_tree(self, data):
+    def display_data_in_tree(self, data, prepared=None):
         """
         Display the given DataFrame in the treeview.
         
         Args:
             data: DataFrame to display
+            prepared: _prepare_preview的结果，未提供时在此计算
         """
         if data is None or data.empty:
             # 如果数据为空，清空树视图
-            for item in self.data_tree.get_children():
-                self.data_tree.delete(item)
+            self._preview_values = np.empty((0, 0), dtype=object)
+            self._preview_tags = []
+            self._preview_first = 0
+            self._render_preview()
             return
-            
-        # Clear existing data
-        for item in self.data_tree.get_children():
-            self.data_tree.delete(item)
         
-        data_type = self.current_data_type.get()
-        sheet = self.current_sheet.get()
+        if prepared is None:
+            prepared = self._prepare_preview(self.current_data_type.get(), self.current_sheet.get(), data)
+        values, tags = prepared
         
-        # 处理Daily Plan的特殊情况，其有独立的表头
-        headers = None
-        if data_type == "HSA Daily Plan":
-            headers = self.data_loader.get_headers_for_sheet(data_type, sheet)
-            
-        # 制作数据的工作副本，避免修改原始数据
-        # 不再使用全局前向填充，而是有选择地处理每种数据类型
-        working_data = data.copy()
+        # Treeview始终复用同一个实例；列与当前显示的完全相同时（刷新、切换到同结构的sheet）
+        # 保留现有的列、标题和列宽，只替换行
+        if self._preview_columns is None or not self._preview_columns.equals(data.columns):
+            self._configure_preview_columns(data.columns)
+        
+        self._preview_values = values
+        self._preview_tags = tags
+        self._preview_first = 0
+        self._preview_rendered = None
+        self._render_preview()
+    
+    def _configure_preview_columns(self, columns: pd.Index):
+        """
+        设置数据预览Treeview的列、标题和列宽
         
+        Args:
+            columns: 要显示的数据的列名
+        """
         # Configure columns
-        self.data_tree['columns'] = list(data.columns)
+        self.data_tree['columns'] = list(columns)
         self.data_tree['show'] = 'headings'
         
         # Set column headings
-        for col in data.columns:
-            # Limit column width for better display
-            display_text = str(col)
-            
-            # Handle datetime column names and remove time part if it's 00:00:00
-            if isinstance(col, datetime.datetime):
-                # 检查是否是标准日期格式（时间部分为00:00:00）
-                if col.hour == 0 and col.minute == 0 and col.second == 0:
-                    display_text = col.strftime('%Y-%m-%d')
-                # 检查是否是类似 2025-03-02 00:00:00.1 格式
-                elif str(col).endswith('00:00:00.1') or '.1' in str(col):
-                    # 提取日期部分
-                    date_part = col.strftime('%Y-%m-%d')
-                    # 如果是类似带小数的时间部分，保留特殊标记（如T4）
-                    display_text = date_part
-                else:
-                    display_text = col.strftime('%Y-%m-%d')
-                
-            col_width = min(150, max(50, len(display_text) * 10))
+        # datetime列名只显示日期部分（时间部分均为00:00:00或其重复列变体）
+        heading_texts = [
+            col.strftime('%Y-%m-%d') if isinstance(col, datetime.datetime) else str(col)
+            for col in columns
+        ]
+        
+        # Limit column width for better display：所有列宽一次性计算，限制在50~150之间
+        col_widths = np.clip(np.char.str_len(np.array(heading_texts, dtype=str)) * 10, 50, 150)
+        
+        for col, display_text, col_width in zip(columns, heading_texts, col_widths.tolist()):
             self.data_tree.column(col, width=col_width, anchor='w')
             self.data_tree.heading(col, text=display_text)
+        
+        self._preview_columns = columns
+    
+    def _prepare_preview(self, data_type, sheet, data):
+        """
+        将预览数据格式化为显示文本，不访问Tk组件，可以在后台线程中调用
+        
+        同一份数据重复预览（切换sheet、刷新）时直接复用格式化结果
+        
+        Args:
+            data_type: 数据类型
+            sheet: 工作表名称
+            data: 要显示的数据
             
+        Returns:
+            (格式化后的全部行, 每行的样式标签)
+        """
+        # 处理Daily Plan的特殊情况，其有独立的表头
+        headers = None
+        if data_type == "HSA Daily Plan":
+            headers = self.data_loader.get_headers_for_sheet(data_type, sheet)
+        
+        # 不再使用全局前向填充，而是有选择地处理每种数据类型
+        # DataLoader启用了写时复制，这里只读遍历，无需复制原始数据
+        cached = self._preview_cache.get((data_type, sheet))
+        if cached is not None and cached[0] is data and cached[1] is headers:
+            return cached[2], cached[3]
+        
+        values = self._format_values(data)
+        # Add data rows with alternating colors (zebra stripes)
+        tags = ['evenrow' if i % 2 == 0 else 'oddrow' for i in range(len(values))]
+        
         # 如果是Daily Plan，额外添加表头行
         if headers is not None and not headers.empty:
-            # 清除所有行并重新设置表头行
-            for item in self.data_tree.get_children():
-                self.data_tree.delete(item)
-                
-            # 添加表头行
-            for i, row in headers.iterrows():
-                values = []
-                for val in row.values:
-                    if pd.isna(val):
-                        values.append("")
-                    elif isinstance(val, (float, np.float64)) and val.is_integer():
-                        values.append(str(int(val)))
-                    else:
-                        values.append(str(val))
-                
-                self.data_tree.insert('', 'end', values=values, tags=('header',))
+            values = np.concatenate([self._format_values(headers), values])
+            tags = ['header'] * len(headers) + tags
         
-        # Add data rows with alternating colors (zebra stripes)
-        count = 0
-        for i, row in working_data.iterrows():
-            # Convert values to strings, handling NaN values
-            values = []
-            for val in row.values:
-                if pd.isna(val):
-                    values.append("")
-                elif isinstance(val, (float, np.float64)) and val.is_integer():
-                    # Format integer-valued floats as integers
-                    values.append(str(int(val)))
-                else:
-                    values.append(str(val))
+        self._preview_cache[(data_type, sheet)] = (data, headers, values, tags)
+        return values, tags
+    
+    def _preview_visible_rows(self) -> int:
+        """
+        计算数据预览中可以同时显示的行数
+        
+        Returns:
+            可见行数（多算一行以覆盖半行）
+        """
+        row_height = ttk.Style().lookup('Treeview', 'rowheight')
+        row_height = int(row_height) if row_height else 20
+        tree_height = self.data_tree.winfo_height()
+        if tree_height <= 1:
+            # 尚未显示时按默认窗口高度估算
+            tree_height = 400
+        return max(1, tree_height // row_height + 1)
+    
+    def _render_preview(self):
+        """
+        只把当前可见范围内的行插入Treeview，并同步滚动条位置
+        
+        显示耗时和内存只与可见行数有关，与数据总行数无关
+        """
+        total = len(self._preview_values)
+        visible = self._preview_visible_rows()
+        first = max(0, min(self._preview_first, total - visible))
+        last = min(first + visible, total)
+        self._preview_first = first
+        
+        # 窗口尺寸变化、滚动到边界后继续滚动等情况下可见范围不变，无需重新插入
+        rendered = self._preview_rendered
+        if rendered is not None and rendered[0] is self._preview_values and rendered[1:] == (first, last):
+            return
+        self._preview_rendered = (self._preview_values, first, last)
+        
+        self.data_tree.delete(*self.data_tree.get_children())
+        if last > first:
+            rows = tuple(tuple(self._preview_values[i].tolist()) for i in range(first, last))
+            self.data_tree.tk.call('::treeview_insert_rows', str(self.data_tree),
+                                   rows, tuple(self._preview_tags[first:last]))
+        
+        if total:
+            self.data_y_scrollbar.set(first / total, last / total)
+        else:
+            self.data_y_scrollbar.set(0, 1)
+    
+    def _on_preview_yview(self, *args):
+        """
+        垂直滚动条回调，参数与Treeview.yview相同（moveto/scroll）
+        
+        Args:
+            args: ('moveto', fraction) 或 ('scroll', number, 'units'|'pages')
+        """
+        total = len(self._preview_values)
+        if args[0] == 'moveto':
+            self._preview_first = int(float(args[1]) * total)
+        elif args[0] == 'scroll':
+            step = self._preview_visible_rows() - 1 if args[2] == 'pages' else 1
+            self._preview_first += int(args[1]) * max(1, step)
+        self._render_preview()
+    
+    def _on_preview_mousewheel(self, event):
+        """
+        数据预览的鼠标滚轮滚动（Windows/macOS使用delta，X11使用Button-4/5）
+        
+        Args:
+            event: Tk事件
+        """
+        if event.num == 4 or event.delta > 0:
+            self._on_preview_yview('scroll', -3, 'units')
+        else:
+            self._on_preview_yview('scroll', 3, 'units')
+        return "break"
             
-            # Apply alternating row colors
-            tag = 'evenrow' if count % 2 == 0 else 'oddrow'
-            self.data_tree.insert('', 'end', values=values, tags=(tag,))
-            count += 1
+    @classmethod
+    def _format_values(cls, frame: pd.DataFrame) -> np.ndarray:
+        """
+        将DataFrame整体转换为显示文本的二维数组
+        
+        数值列逐列向量化格式化，分类列只格式化各个类别，不再对其中每个单元格调用Python函数
+        
+        Args:
+            frame: 要显示的DataFrame
+            
+        Returns:
+            与frame形状相同的字符串数组（object类型）
+        """
+        if frame.size == 0:
+            return frame.to_numpy(dtype=object)
+        if len(frame) < _COLUMNWISE_FORMAT_MIN_ROWS:
+            return np.frompyfunc(cls._format_cell, 1, 1)(frame.to_numpy(dtype=object))
+        
+        result = np.empty(frame.shape, dtype=object)
+        generic_positions = []
+        for position, (_, column) in enumerate(frame.items()):
+            dtype = column.dtype
+            if isinstance(dtype, pd.CategoricalDtype):
+                # 分类列只格式化各个类别一次，再按编码取值，缺失值（编码-1）取末尾的空字符串
+                labels = cls._format_values(dtype.categories.to_frame())[:, 0]
+                result[:, position] = np.append(labels, "")[column.cat.codes.to_numpy()]
+            elif isinstance(dtype, np.dtype) and dtype.kind == 'f':
+                result[:, position] = cls._format_floats(column.to_numpy(dtype=np.float64))
+            elif isinstance(dtype, np.dtype) and dtype.kind in 'iu':
+                result[:, position] = column.to_numpy().astype(str)
+            else:
+                generic_positions.append(position)
+        
+        # 混合类型的object列等无法向量化，整块一次取出后逐个单元格格式化
+        if generic_positions:
+            values = frame.iloc[:, generic_positions].to_numpy(dtype=object)
+            result[:, generic_positions] = np.frompyfunc(cls._format_cell, 1, 1)(values)
+        return result
+    
+    @staticmethod
+    def _format_floats(values: np.ndarray) -> np.ndarray:
+        """
+        将float64数组整体转换为显示文本，结果与逐个单元格调用_format_cell相同
+        
+        Args:
+            values: float64数组
+            
+        Returns:
+            与values形状相同的字符串数组（object类型）
+        """
+        result = values.astype(str).astype(object)
+        # 整数值的浮点数去掉小数部分，超出int64范围的逐个转换
+        integral = np.isfinite(values) & (values == np.trunc(values))
+        if integral.any():
+            whole = values[integral]
+            if np.abs(whole).max() < 2.0 ** 63:
+                result[integral] = whole.astype(np.int64).astype(str)
+            else:
+                result[integral] = [str(int(val)) for val in whole]
+        result[np.isnan(values)] = ""
+        return result
+    
+    @staticmethod
+    def _format_cell(val) -> str:
+        """
+        将单元格值格式化为显示文本，表头行和数据行共用
+        
+        Args:
+            val: 单元格值
+            
+        Returns:
+            显示文本，空值为空字符串，整数值的浮点数去掉小数部分
+        """
+        if pd.isna(val):
+            return ""
+        if isinstance(val, (float, np.floating)) and val.is_integer():
+            # Format integer-valued floats as integers
+            return str(int(val))
+        return str(val)
             
     def update_status(self):
         """
@@ -698,29 +917,54 @@ class ProductionSchedulingSystem:
             level: Message level (INFO, ERROR, SUCCESS, etc.)
             message: The message to log
         """
-        self.log_text.config(state=tk.NORMAL)
-        
-        # Get current time
-        timestamp = datetime.datetime.now().strftime('%H:%M:%S')
+        # Get current time (formatted at most once per second)
+        now = int(time.time())
+        if now != self._ts_cache[0]:
+            self._ts_cache = (now, time.strftime('%H:%M:%S', time.localtime(now)))
+        timestamp = self._ts_cache[1]
         
         # Check if message contains bold formatting
         if "**" in message:
             # Parse bold text
             parts = message.split("**")
             log_prefix = f"[{timestamp}] {level}: "
-            self.log_text.insert(tk.END, log_prefix, "normal")
+            self._log_buffer.extend((log_prefix, "normal"))
             
             for i, part in enumerate(parts):
                 if i % 2 == 1:  # Odd indices are bold
-                    self.log_text.insert(tk.END, part, "bold")
+                    self._log_buffer.extend((part, "bold"))
                 else:  # Even indices are normal
-                    self.log_text.insert(tk.END, part, "normal")
+                    self._log_buffer.extend((part, "normal"))
             
-            self.log_text.insert(tk.END, "\n", "normal")
+            self._log_buffer.extend(("\n", "normal"))
         else:
             # Normal message without formatting
             log_entry = f"[{timestamp}] {level}: {message}\n"
-            self.log_text.insert(tk.END, log_entry, "normal")
+            self._log_buffer.extend((log_entry, "normal"))
+        
+        # 连续的多条日志合并到空闲时一次写入，日志控件只刷新一次
+        if not self._log_pending:
+            self._log_pending = True
+            self.root.after_idle(self._flush_log)
+    
+    def _flush_log(self):
+        """
+        将缓冲的日志一次性写入日志控件
+        """
+        self._log_pending = False
+        # 先换出缓冲区，写入期间其他线程记录的日志留到下一次写入
+        buffer, self._log_buffer = self._log_buffer, []
+        if not buffer:
+            return
+        
+        self.log_text.config(state=tk.NORMAL)
+        # Text.insert支持交替传入多段 (文本, 标签)，一次调用写入全部缓冲内容
+        self.log_text.insert(tk.END, *buffer)
+        
+        # 每条日志以换行结尾，'end-1c'位于最后一行之后的空行
+        last_line = int(self.log_text.index('end-1c').split('.')[0])
+        if last_line - 1 > _LOG_MAX_LINES:
+            self.log_text.delete('1.0', f'{last_line - _LOG_MAX_LINES}.0')
         
         # Scroll to the end
         self.log_text.see(tk.END)
@@ -730,6 +974,8 @@ class ProductionSchedulingSystem:
         """
         Clear the system log.
         """
+        # 尚未写入的日志一并清空
+        self._log_buffer.clear()
         self.log_text.config(state=tk.NORMAL)
         self.log_text.delete(1.0, tk.END)
         self.log_text.config(state=tk.DISABLED)
@@ -1,6 +1,8 @@
 import pandas as pd
 import os
 
+from src.core.data_loader import EXCEL_ENGINE
+
 # Directory containing the Excel files
 data_dir = "数据表"
 
@@ -19,7 +21,8 @@ def explore_excel(file_path):
     print(f"{'='*50}")
     
     # Get sheet names
-    xlsx = pd.ExcelFile(file_path)
+    # 工作簿只打开一次，后续各sheet直接从同一对象解析，不再重复读取整个文件
+    xlsx = pd.ExcelFile(file_path, engine=EXCEL_ENGINE)
     sheets = xlsx.sheet_names
     print(f"Sheet names: {sheets}")
     
@@ -27,13 +30,15 @@ def explore_excel(file_path):
     for sheet in sheets:
         print(f"\nSheet: {sheet}")
         try:
-            df = pd.read_excel(file_path, sheet_name=sheet)
+            df = xlsx.parse(sheet_name=sheet)
             print(f"Shape: {df.shape}")
             print(f"Columns: {df.columns.tolist()}")
             print("First few rows:")
             print(df.head(3))
         except Exception as e:
             print(f"Error reading sheet {sheet}: {e}")
+    
+    xlsx.close()
 
 # Explore each Excel file
 for file in files:
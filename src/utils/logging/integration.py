@@ -9,6 +9,16 @@ import logging
 from .logger_factory import LoggerFactory
 
 
+# 模块名 -> 对应日志记录器的获取函数，只创建实际用到的日志记录器
+_MODULE_LOGGER_GETTERS = {
+    'lca_capacity_loss': LoggerFactory.get_lca_logger,
+    'event_manager': LoggerFactory.get_event_logger,
+    'data_loader': LoggerFactory.get_data_logger,
+    'main_ui': LoggerFactory.get_system_logger,
+    'database_manager': LoggerFactory.get_system_logger
+}
+
+
 def setup_system_logging():
     """设置系统级日志"""
     # 设置日志目录
@@ -35,15 +45,7 @@ def get_module_logger(module_name: str) -> logging.Logger:
     Returns:
         日志记录器
     """
-    logger_mapping = {
-        'lca_capacity_loss': LoggerFactory.get_lca_logger(),
-        'event_manager': LoggerFactory.get_event_logger(),
-        'data_loader': LoggerFactory.get_data_logger(),
-        'main_ui': LoggerFactory.get_system_logger(),
-        'database_manager': LoggerFactory.get_system_logger()
-    }
-    
-    return logger_mapping.get(module_name, LoggerFactory.get_system_logger())
+    return _MODULE_LOGGER_GETTERS.get(module_name, LoggerFactory.get_system_logger)()
 
 
 def log_lca_event_start(event_id: str, event_data: dict):
@@ -9,7 +9,7 @@ import os
 import re
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
-from collections import defaultdict, Counter
+from collections import defaultdict, deque, Counter
 
 
 class LogAnalyzer:
@@ -35,14 +35,17 @@ class LogAnalyzer:
         Returns:
             日志文件路径列表
         """
-        if not os.path.exists(self.log_dir):
-            return []
-        
+        # scandir返回的目录项自带文件名、路径和类型信息，无需逐个拼接路径；
+        # 目录不存在时直接由scandir报错，省去单独的exists检查
         log_files = []
-        for filename in os.listdir(self.log_dir):
-            if filename.endswith('.log'):
-                if date_filter is None or date_filter in filename:
-                    log_files.append(os.path.join(self.log_dir, filename))
+        try:
+            with os.scandir(self.log_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.log') and entry.is_file():
+                        if date_filter is None or date_filter in entry.name:
+                            log_files.append(entry.path)
+        except FileNotFoundError:
+            return []
         
         return sorted(log_files)
     
@@ -57,6 +60,7 @@ class LogAnalyzer:
             解析后的日志条目列表
         """
         log_entries = []
+        file_name = os.path.basename(file_path)
         
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
@@ -70,7 +74,7 @@ class LogAnalyzer:
                         time_str, level, message = match.groups()
                         
                         entry = {
-                            'file': os.path.basename(file_path),
+                            'file': file_name,
                             'line_number': line_num,
                             'time': time_str,
                             'level': level,
@@ -95,42 +99,42 @@ class LogAnalyzer:
             日志分析报告
         """
         log_files = self.get_log_files(date_filter)
-        all_entries = []
         
-        # 解析所有日志文件
-        for file_path in log_files:
-            entries = self.parse_log_file(file_path)
-            all_entries.extend(entries)
-        
-        # 统计分析
-        level_counts = Counter(entry['level'] for entry in all_entries)
+        # 逐个文件解析并直接统计，不保留全部日志条目；
+        # 错误和警告只需最近10条，用定长队列保存
+        total_entries = 0
+        level_counts = Counter()
         hourly_distribution = defaultdict(int)
-        error_messages = []
-        warning_messages = []
+        error_messages = deque(maxlen=10)
+        warning_messages = deque(maxlen=10)
         
-        for entry in all_entries:
-            # 按小时分布统计
-            hour = entry['time'][:2]
-            hourly_distribution[hour] += 1
-            
-            # 收集错误和警告信息
-            if entry['level'] == 'ERROR':
-                error_messages.append(entry)
-            elif entry['level'] == 'WARNING':
-                warning_messages.append(entry)
+        for file_path in log_files:
+            for entry in self.parse_log_file(file_path):
+                total_entries += 1
+                level_counts[entry['level']] += 1
+                
+                # 按小时分布统计
+                hour = entry['time'][:2]
+                hourly_distribution[hour] += 1
+                
+                # 收集错误和警告信息
+                if entry['level'] == 'ERROR':
+                    error_messages.append(entry)
+                elif entry['level'] == 'WARNING':
+                    warning_messages.append(entry)
         
         # 生成报告
         report = {
             'summary': {
-                'total_entries': len(all_entries),
+                'total_entries': total_entries,
                 'files_analyzed': len(log_files),
                 'analysis_date': datetime.now().isoformat(),
                 'date_filter': date_filter
             },
             'level_distribution': dict(level_counts),
             'hourly_distribution': dict(hourly_distribution),
-            'errors': error_messages[-10:],  # 最近10个错误
-            'warnings': warning_messages[-10:],  # 最近10个警告
+            'errors': list(error_messages),  # 最近10个错误
+            'warnings': list(warning_messages),  # 最近10个警告
             'files': [os.path.basename(f) for f in log_files]
         }
         
@@ -5,17 +5,36 @@ Logger Factory
 统一创建和管理系统中的各种日志记录器
 """
 
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 from datetime import datetime
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from .log_formatter import CustomFormatter
 
 
+class _InProcessQueueHandler(logging.handlers.QueueHandler):
+    """
+    进程内队列处理器
+
+    记录只在本进程的后台线程中消费，无需像跨进程场景那样把异常信息
+    折叠进消息文本，保留 exc_info 以便下游格式器按原格式输出堆栈。
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 在调用线程中固定消息文本，避免参数对象随后被修改
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
 class LoggerFactory:
     """日志工厂类，负责创建和配置各种日志记录器"""
     
     _loggers: Dict[str, logging.Logger] = {}
+    _listeners: Dict[str, logging.handlers.QueueListener] = {}
     _log_dir = "logs"
     
     @classmethod
@@ -61,12 +80,15 @@ class LoggerFactory:
         from .log_formatter import UnifiedFormatter
         formatter = UnifiedFormatter(include_module=True) if unified_log else CustomFormatter()
         
+        # 实际输出的处理器交由后台监听线程执行，调用线程只负责入队
+        handlers: List[logging.Handler] = []
+        
         # 添加控制台处理器
         if console_logging:
             console_handler = logging.StreamHandler()
             console_handler.setLevel(level)
             console_handler.setFormatter(CustomFormatter())  # 控制台仍使用原格式
-            logger.addHandler(console_handler)
+            handlers.append(console_handler)
         
         # 添加文件处理器
         if file_logging:
@@ -82,7 +104,16 @@ class LoggerFactory:
             file_handler = logging.FileHandler(log_file, encoding='utf-8')
             file_handler.setLevel(level)
             file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
+            handlers.append(file_handler)
+        
+        if handlers:
+            log_queue = queue.SimpleQueue()
+            logger.addHandler(_InProcessQueueHandler(log_queue))
+            listener = logging.handlers.QueueListener(
+                log_queue, *handlers, respect_handler_level=True
+            )
+            listener.start()
+            cls._listeners[name] = listener
         
         # 防止日志向上传播
         logger.propagate = False
@@ -134,9 +165,19 @@ class LoggerFactory:
     
     @classmethod
     def close_all_loggers(cls):
-        """关闭所有日志记录器的文件处理器"""
-        for logger in cls._loggers.values():
-            for handler in logger.handlers:
+        """停止后台监听线程（写出队列中剩余的记录）并关闭所有文件处理器"""
+        for name, listener in cls._listeners.items():
+            listener.stop()
+            for handler in listener.handlers:
                 if isinstance(handler, logging.FileHandler):
                     handler.close()
-        cls._loggers.clear()
\ No newline at end of file
+            # 监听线程已停止，之后仍持有该记录器的代码改为同步输出
+            logger = cls._loggers.get(name)
+            if logger is not None:
+                logger.handlers[:] = listener.handlers
+        cls._listeners.clear()
+        cls._loggers.clear()
+
+
+# 解释器退出时确保队列中的日志全部落盘
+atexit.register(LoggerFactory.close_all_loggers)
\ No newline at end of file
@@ -19,13 +19,20 @@ Product and Head_Qty belong to the same group. The G value is the sum of all
 TTL QTY values within that group.
 """
 
+import os
+import sys
+
 import pandas as pd
 import numpy as np
 
+# 与主系统使用同一个Excel解析引擎（从tools目录直接运行时需要添加项目根目录）
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.core.data_loader import EXCEL_ENGINE
+
 def load_fg_eoh_data(file_path):
     """Load FG EOH.xlsx file and return DataFrame"""
     try:
-        df = pd.read_excel(file_path)
+        df = pd.read_excel(file_path, engine=EXCEL_ENGINE)
         return df
     except Exception as e:
         print(f"Error loading file: {e}")